@@ -1,19 +1,27 @@
 """FastAPI router for URL lookup endpoints."""
 
 import asyncio
-from typing import Annotated
+import time
+from datetime import UTC, datetime
+from functools import lru_cache
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 from src.config import settings
 from src.models.url_check import URLCheckResponse
 from src.services.malware_checker import MalwareChecker
 from src.utils.logging import get_logger
+from src.utils.responses import ORJSONResponse
 
 # Constants
 HTTPS_PORT = 443
+DEFAULT_PORT = 80
+MAX_PORT = 65535
+MAX_PORT_DIGITS = 5
 MIN_LEN_HOSTNAME = 2
 MAX_URL_LENGTH = 2048
+# Settings are frozen, so the API-level timeout is read once at import
+REQUEST_TIMEOUT_SECONDS = settings.api_request_timeout_seconds
 
 logger = get_logger(__name__)
 
@@ -21,42 +29,46 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/urlinfo", tags=["urlinfo"])
 
 
-# Dependency injection using a simple container class
-class MalwareCheckerContainer:
-    _instance: MalwareChecker | None = None
+def _get_checker(request: Request) -> MalwareChecker | None:
+    """Get the malware checker stored on app.state by the application lifespan."""
+    return getattr(request.app.state, "malware_checker", None)
 
-    @classmethod
-    def set(cls, checker: MalwareChecker) -> None:
-        """Set the malware checker instance (called by main.py)."""
-        cls._instance = checker
-
-    @classmethod
-    def get(cls) -> MalwareChecker:
-        """Get the malware checker instance."""
-        if cls._instance is None:
-            raise HTTPException(
-                status_code=503,
-                detail="Malware checker not initialized",
-            )
-        return cls._instance
-
-
-def set_malware_checker(checker: MalwareChecker) -> None:
-    """Set the malware checker instance (called by main.py)."""
-    MalwareCheckerContainer.set(checker)
 
+@lru_cache(maxsize=1024)
+def _split_hostport(hostname_and_port: str) -> tuple[str, int, bool]:
+    """Split a "hostname[:port]" path segment into its parts.
 
-def get_malware_checker() -> MalwareChecker:
-    """Dependency injection function to get the malware checker."""
-    return MalwareCheckerContainer.get()
+    Memoized since the same netloc is typically requested many times.
 
+    Args:
+        hostname_and_port: The hostname and optional port (e.g., "example.com:8080").
 
-@router.get("/1/{hostname_and_port}/{original_path_and_query_string:path}")
+    Returns:
+        Tuple of (hostname, port, port_ok). port falls back to 80 when absent or invalid;
+        port_ok is False when a port was given but is not a number in 0-65535.
+    """
+    # Single pass over the string; no list allocation as with rsplit
+    hostname, sep, port_str = hostname_and_port.rpartition(":")
+    if not sep:
+        return hostname_and_port, DEFAULT_PORT, True
+
+    # Plain ASCII digits only; avoids building a traceback for malformed ports
+    if port_str.isascii() and port_str.isdigit() and len(port_str) <= MAX_PORT_DIGITS:
+        port = int(port_str)
+        if port <= MAX_PORT:
+            return hostname, port, True
+    return hostname, DEFAULT_PORT, False
+
+
+@router.get(
+    "/1/{hostname_and_port}/{original_path_and_query_string:path}",
+    response_model=URLCheckResponse,
+)
 async def lookup_url(
+    request: Request,
     hostname_and_port: str,
     original_path_and_query_string: str = "",
-    checker: Annotated[MalwareChecker, Depends(get_malware_checker)] = None,
-) -> URLCheckResponse:
+) -> ORJSONResponse:
     """Check if a URL is malicious.
 
     Path parameters:
@@ -66,8 +78,12 @@ async def lookup_url(
     Returns:
         JSON response with URL safety information and metadata.
     """
+    checker = _get_checker(request)
     if checker is None:
-        checker = get_malware_checker()
+        raise HTTPException(
+            status_code=503,
+            detail="Malware checker not initialized",
+        )
 
     if not checker.is_ready():
         raise HTTPException(
@@ -75,49 +91,27 @@ async def lookup_url(
             detail="Malware checker not ready",
         )
 
-    # Check total URL length early - use default port/scheme for estimation
-    # Parse port first to get proper scheme
-    port = 80
-    hostname = hostname_and_port
-
-    if ":" in hostname_and_port:
-        parts = hostname_and_port.rsplit(":", 1)
-        hostname = parts[0]
-        try:
-            port = int(parts[1])
-        except (ValueError, IndexError):
-            # Invalid port, will be caught below
-            pass
-
-    # Determine scheme based on port
-    scheme = "https" if port == HTTPS_PORT else "http"
+    hostname, port, port_ok = _split_hostport(hostname_and_port)
+    if not port_ok:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid port number in hostname:port",
+        )
 
-    normalized_path = (
-        f"/{original_path_and_query_string}" if original_path_and_query_string else "/"
-    )
-    tentative_url = f"{scheme}://{hostname}:{port}{normalized_path}"
+    # Normalize path
+    path = f"/{original_path_and_query_string}" if original_path_and_query_string else "/"
+
+    # Check total URL length early - determine scheme based on port and measure
+    # "{scheme}://{hostname}:{port}{path}" without building the string
+    scheme = "https" if port == HTTPS_PORT else "http"
+    url_length = len(scheme) + len("://") + len(hostname) + 1 + len(str(port)) + len(path)
 
-    if len(tentative_url) > MAX_URL_LENGTH:
+    if url_length > MAX_URL_LENGTH:
         raise HTTPException(
             status_code=414,
             detail=f"URL exceeds maximum length of {MAX_URL_LENGTH} characters",
         )
 
-    # Validate the port number parsing didn't fail
-    if ":" in hostname_and_port:
-        parts = hostname_and_port.rsplit(":", 1)
-        hostname = parts[0]
-        try:
-            port = int(parts[1])
-        except (ValueError, IndexError):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid port number in hostname:port",
-            ) from None
-    else:
-        hostname = hostname_and_port
-        port = 80
-
     # Validate hostname
     if not hostname or len(hostname) < MIN_LEN_HOSTNAME:
         raise HTTPException(
@@ -125,40 +119,47 @@ async def lookup_url(
             detail="Invalid hostname",
         )
 
-    # Normalize path
-    path = f"/{original_path_and_query_string}" if original_path_and_query_string else "/"
-
     try:
         # Check if URL is malicious with API-level timeout
-        timeout = settings.api_request_timeout_seconds
-        coro = checker.check_url(hostname, port, path)
-        is_malicious, databases_queried, result_details = await asyncio.wait_for(
-            coro, timeout=timeout
-        )
-
-        # Construct full URL for response - determine scheme based on port
-        response_scheme = "https" if port == HTTPS_PORT else "http"
-        full_url = f"{response_scheme}://{hostname}:{port}{path}"
-
-        return URLCheckResponse(
-            url=full_url,
-            is_malicious=is_malicious,
-            threat_level=result_details.get("threat_level", "safe"),
-            threat_type=result_details.get("threat_type"),
-            confidence_score=result_details.get("confidence_score", 1.0 if is_malicious else 0.0),
-            cached=result_details.get("cached", False),
-            databases_queried=databases_queried,
-            response_time_ms=result_details.get("response_time_ms", 0.0),
+        timeout = REQUEST_TIMEOUT_SECONDS
+        start_ns = time.perf_counter_ns()
+        async with asyncio.timeout(timeout):
+            is_malicious, databases_queried, result_details = await checker.check_url(
+                hostname, port, path
+            )
+        check_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+        cached = result_details.get("cached", False)
+
+        # Construct full URL for response
+        full_url = f"{scheme}://{hostname}:{port}{path}"
+
+        # Build the response body directly; URLCheckResponse only documents the schema
+        return ORJSONResponse(
+            {
+                "url": full_url,
+                "is_malicious": is_malicious,
+                "threat_level": result_details.get("threat_level", "safe"),
+                "threat_type": result_details.get("threat_type"),
+                "confidence_score": result_details.get(
+                    "confidence_score", 1.0 if is_malicious else 0.0
+                ),
+                "cached": cached,
+                "databases_queried": databases_queried,
+                "response_time_ms": result_details.get("response_time_ms", 0.0),
+                "timestamp": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+            },
+            # Time spent in the check, labelled by where the verdict came from
+            headers={"Server-Timing": f"{'cache' if cached else 'db'};dur={check_ms:.3f}"},
         )
 
     except TimeoutError:
-        logger.warning(f"URL check timed out for {hostname}:{port}{path} after {timeout}s")
+        logger.warning("URL check timed out for %s:%d%s after %ss", hostname, port, path, timeout)
         raise HTTPException(
             status_code=503,
             detail=f"URL check timed out after {timeout} seconds",
         ) from None
     except Exception as e:
-        logger.error(f"Error checking URL {hostname}:{port}{path}: {e}")
+        logger.error("Error checking URL %s:%d%s: %s", hostname, port, path, e)
         raise HTTPException(
             status_code=500,
             detail="Failed to check URL",
@@ -166,9 +167,7 @@ async def lookup_url(
 
 
 @router.get("/health")
-async def health_check(
-    checker: Annotated[MalwareChecker, Depends(get_malware_checker)] = None,
-) -> dict:
+async def health_check(request: Request) -> dict:
     """Check health of URL lookup service.
 
     Returns:
@@ -178,11 +177,8 @@ async def health_check(
         - loader_status: Status of all loaders
         - timestamp: Current timestamp
     """
-
+    checker = _get_checker(request)
     if checker is None:
-        checker = get_malware_checker()
-
-    if not checker:
         return {
             "status": "not_initialized",
             "service": "urlinfo",
@@ -202,8 +198,8 @@ async def health_check(
     }
 
 
-@router.get("/1/{rest_of_path:path}")
-async def catch_invalid_url_paths(rest_of_path: str) -> URLCheckResponse:
+@router.get("/1/{rest_of_path:path}", response_model=URLCheckResponse)
+async def catch_invalid_url_paths(request: Request, rest_of_path: str) -> ORJSONResponse:
     """Catch all requests to /1/* and validate path structure.
 
     This catches requests that don't match the hostname:port/path pattern.
@@ -228,4 +224,4 @@ async def catch_invalid_url_paths(rest_of_path: str) -> URLCheckResponse:
         )
 
     # Delegate to main handler
-    return await lookup_url(hostname_and_port, original_path_and_query_string)
+    return await lookup_url(request, hostname_and_port, original_path_and_query_string)
@@ -1,13 +1,16 @@
 """Configuration management for the Malware URL Detection API."""
 
-from pydantic import ConfigDict
-from pydantic_settings import BaseSettings
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    """Application configuration loaded from environment variables."""
+    """Application configuration loaded from environment variables.
 
-    model_config = ConfigDict(env_file=".env", case_sensitive=False)
+    Frozen after load, so modules may safely cache values read from it.
+    """
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, frozen=True)
 
     # Database Configuration
     malware_db_files: list[str] = ["data/malware_lists/sample_malware.csv"]
@@ -17,15 +20,24 @@ class Settings(BaseSettings):
     cache_enabled: bool = True
     cache_ttl_seconds: int = 3600  # 1 hour
     cache_max_entries: int = 10000
+    # Keep frequently requested URLs cached when one-off URLs would evict them
+    cache_admission_filter: bool = True
 
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
-    api_log_level: str = "INFO"
+    api_log_level: str = "info"  # normalized to lowercase
 
     # Performance Configuration
     db_query_timeout_seconds: float = 5.0
     connection_pool_size: int = 100
+    # Keep Nagle's algorithm on HTTP loader sockets (e.g. for bulk endpoints)
+    http_loader_no_nodelay: bool = False
+    # Coalesce concurrent HTTP loader lookups into batch requests (0 disables)
+    http_loader_batch_size: int = 0
+    http_loader_batch_wait_ms: float = 2.0
+    # Maximum concurrent requests per HTTP loader; excess lookups wait for a slot
+    http_loader_max_in_flight: int = 64
     # API request timeout: maximum time to allow a full request to complete (seconds)
     api_request_timeout_seconds: float = 10.0
 
@@ -33,6 +45,12 @@ class Settings(BaseSettings):
     enable_cors: bool = False
     cors_origins: list[str] = ["*"]
 
+    @field_validator("api_log_level")
+    @classmethod
+    def normalize_log_level(cls, v: str) -> str:
+        """Lowercase the log level once at load time."""
+        return v.lower()
+
 
 # Global settings instance
 settings = Settings()
@@ -7,7 +7,8 @@ import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.api import urlinfo
 from src.config import settings
@@ -16,6 +17,7 @@ from src.services.database_loaders.http_loader import HTTPLoader
 from src.services.malware_checker import MalwareChecker
 from src.utils import metrics
 from src.utils.logging import generate_request_id, get_logger, set_request_id, setup_logging
+from src.utils.responses import ORJSONResponse
 
 # Setup logging
 setup_logging()
@@ -25,36 +27,61 @@ logger = get_logger(__name__)
 malware_checker: MalwareChecker | None = None
 
 
-class RequestTimeoutMiddleware(BaseHTTPMiddleware):
-    """Middleware to track request processing time and add response timing header."""
+class ObservabilityMiddleware:
+    """Pure ASGI middleware for request IDs, response timing, metrics and error handling.
 
-    async def dispatch(self, request: Request, call_next):
-        """Track request duration and add X-Response-Time header."""
-        metrics.incr("requests_total")
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000.0
-        response.headers["X-Response-Time"] = f"{process_time:.2f}"
-        metrics.timing("response_time_ms", process_time)
-        metrics.incr("responses_total")
-        logger.debug(f"{request.method} {request.url.path} completed in {process_time:.2f}ms")
-        return response
+    Combines what would otherwise be several BaseHTTPMiddleware layers, each of which
+    spawns a task and wraps the response stream on every request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the downstream ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add request ID and timing headers and catch unhandled exceptions."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        # Add request ID to all requests for correlation
+        request_id = Headers(scope=scope).get("X-Request-ID") or generate_request_id()
+        set_request_id(request_id)
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Middleware to catch and log unhandled exceptions."""
+        metrics.incr("requests_total")
+        start_ns = time.perf_counter_ns()
+        response_started = False
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                process_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+                headers = MutableHeaders(scope=message)
+                headers["X-Response-Time"] = f"{process_time:.2f}"
+                # Joins any handler-level entries (e.g. cache/db) in the same header
+                headers.append("Server-Timing", f"total;dur={process_time:.3f}")
+                headers["X-Request-ID"] = request_id
+                metrics.timing("response_time_ms", process_time)
+                metrics.incr("responses_total")
+                logger.debug(
+                    "%s %s completed in %.2fms", scope["method"], scope["path"], process_time
+                )
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next):
-        """Catch exceptions and return structured error responses."""
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_with_headers)
         except Exception as exc:
-            request_id = request.headers.get("X-Request-ID", "unknown")
+            if response_started:
+                raise
             logger.error(
-                f"Unhandled exception in {request.method} {request.url.path}: {exc}",
+                "Unhandled exception in %s %s: %s",
+                scope["method"],
+                scope["path"],
+                exc,
                 exc_info=True,
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal server error",
@@ -63,6 +90,7 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                     "type": "internal_error",
                 },
             )
+            await response(scope, receive, send_with_headers)
 
 
 def create_malware_checker() -> MalwareChecker:
@@ -78,7 +106,7 @@ def create_malware_checker() -> MalwareChecker:
             timeout_seconds=settings.db_query_timeout_seconds,
         )
         loaders.append(loader)
-        logger.info(f"Configured file loader: {loader.name} -> {file_path}")
+        logger.info("Configured file loader: %s -> %s", loader.name, file_path)
 
     # Add HTTP-based loaders
     for idx, http_url in enumerate(settings.malware_db_http_urls):
@@ -87,12 +115,17 @@ def create_malware_checker() -> MalwareChecker:
             endpoint_url=http_url,
             method="GET",
             timeout_seconds=settings.db_query_timeout_seconds,
+            max_connections=settings.connection_pool_size,
+            tcp_nodelay=not settings.http_loader_no_nodelay,
+            max_batch=settings.http_loader_batch_size,
+            batch_wait_ms=settings.http_loader_batch_wait_ms,
+            max_in_flight=settings.http_loader_max_in_flight,
         )
         loaders.append(loader)
-        logger.info(f"Configured HTTP loader: {loader.name} -> {http_url}")
+        logger.info("Configured HTTP loader: %s -> %s", loader.name, http_url)
 
     checker = MalwareChecker(loaders, cache_enabled=settings.cache_enabled)
-    logger.info(f"Created malware checker with {len(loaders)} loaders")
+    logger.info("Created malware checker with %d loaders", len(loaders))
     return checker
 
 
@@ -103,17 +136,19 @@ async def lifespan(_app: FastAPI):
     # Startup
     logger.info("Starting Malware URL Detection API")
     logger.info(
-        f"Configuration: host={settings.api_host}, port={settings.api_port}, "
-        f"cache_enabled={settings.cache_enabled}, cache_ttl={settings.cache_ttl_seconds}s"
+        "Configuration: host=%s, port=%s, cache_enabled=%s, cache_ttl=%ss",
+        settings.api_host,
+        settings.api_port,
+        settings.cache_enabled,
+        settings.cache_ttl_seconds,
     )
 
     # Initialize malware checker
     malware_checker = create_malware_checker()
     await malware_checker.initialize()
     app.state.malware_checker = malware_checker
-    urlinfo.set_malware_checker(malware_checker)
 
-    logger.info(f"Malware checker ready: {malware_checker.get_status()}")
+    logger.info("Malware checker ready: %s", malware_checker.get_status())
 
     yield
 
@@ -129,6 +164,7 @@ app = FastAPI(
     description="Fast, async-native service for detecting malicious URLs",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -140,19 +176,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add custom middleware
-app.add_middleware(ErrorHandlingMiddleware)
-app.add_middleware(RequestTimeoutMiddleware)
-
-
-@app.middleware("http")
-async def request_id_middleware(request: Request, call_next):
-    """Add request ID to all requests for correlation."""
-    request_id = request.headers.get("X-Request-ID") or generate_request_id()
-    set_request_id(request_id)
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
+# Add custom middleware (outermost, so timing and request IDs cover CORS responses too)
+app.add_middleware(ObservabilityMiddleware)
 
 
 @app.get("/health")
@@ -177,7 +202,11 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with request context."""
     request_id = request.headers.get("X-Request-ID", "unknown")
     logger.warning(
-        f"HTTP {exc.status_code} error for {request.method} {request.url.path}: {exc.detail}",
+        "HTTP %s error for %s %s: %s",
+        exc.status_code,
+        request.method,
+        request.url.path,
+        exc.detail,
         extra={"request_id": request_id},
     )
     return JSONResponse(
@@ -197,7 +226,10 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions."""
     request_id = request.headers.get("X-Request-ID", "unknown")
     logger.error(
-        f"Unhandled exception for {request.method} {request.url.path}: {exc}",
+        "Unhandled exception for %s %s: %s",
+        request.method,
+        request.url.path,
+        exc,
         exc_info=True,
         extra={"request_id": request_id},
     )
@@ -219,5 +251,5 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=True,
-        log_level=settings.api_log_level.lower(),
+        log_level=settings.api_log_level,
     )
@@ -1,32 +1,36 @@
 """Abstract base class for malware database loaders."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import datetime
+from typing import Any
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ThreatInfo:
-    """Information about a detected threat."""
+    """Information about a detected threat.
+
+    Uses __slots__ since one instance is created per loader for every lookup.
+    Frozen because loaders may hand the same instance to every caller.
+    """
 
     is_malicious: bool
     threat_type: str | None = None
     threat_level: str = "safe"  # safe, low, medium, high, critical
     confidence_score: float = 1.0
-    metadata: dict | None = None
+    metadata: Mapping[str, Any] | None = None
     detected_by: str | None = None
+    # Optional detection time; not filled in automatically to keep construction cheap
     timestamp: datetime | None = None
 
     def __post_init__(self):
         """Validate and normalize threat data."""
-        if self.timestamp is None:
-            self.timestamp = datetime.now(tz=UTC)
-
         if self.is_malicious and self.threat_level == "safe":
-            self.threat_level = "medium"
+            object.__setattr__(self, "threat_level", "medium")
 
         if self.metadata is None:
-            self.metadata = {}
+            object.__setattr__(self, "metadata", {})
 
 
 class BaseLoader(ABC):
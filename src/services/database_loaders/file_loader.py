@@ -2,17 +2,45 @@
 
 import asyncio
 import csv
-import json
+import io
+import sys
 from pathlib import Path
+from types import MappingProxyType
 
 import aiofiles
+import orjson
 
 from src.services.database_loaders.base import BaseLoader, ThreatInfo
 from src.utils.logging import get_logger
 
+# Constants
+DEFAULT_PORT = 80
+INLINE_PARSE_MAX_CHARS = 1_048_576  # ~1MB
+
 logger = get_logger(__name__)
 
 
+def _parse_port(value: object) -> int:
+    """Parse a port value from a malware list entry.
+
+    Digit checks are used instead of catching int() failures, since this runs
+    once per entry on potentially large files.
+
+    Args:
+        value: Raw port value (string from CSV, string or number from JSON).
+
+    Returns:
+        The port number, or 80 if the value is missing or not numeric.
+    """
+    if isinstance(value, int | float):
+        return int(value)
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isascii() and value.isdigit():
+            return int(value)
+    return DEFAULT_PORT
+
+
 class FileLoader(BaseLoader):
     """Load malware URLs from CSV or JSON files."""
 
@@ -34,7 +62,11 @@ class FileLoader(BaseLoader):
         super().__init__(name, timeout_seconds)
         self.file_path = Path(file_path)
         self.file_format = file_format.lower()
-        self.malware_urls: set[tuple[str, int, str]] = set()
+        # hostname -> port -> paths; exact and hostname+port matches are dict probes
+        self._index: dict[str, dict[int, set[str]]] = {}
+        self._size = 0
+        # Shared lookup results, rebuilt once the database is loaded
+        self._refresh_results()
 
         if self.file_format not in ("csv", "json"):
             msg = f"Unsupported format: {self.file_format}"
@@ -43,8 +75,9 @@ class FileLoader(BaseLoader):
     async def initialize(self) -> None:
         """Load malware URLs from file into memory."""
         if not self.file_path.exists():
-            logger.warning(f"Malware file not found: {self.file_path}")
+            logger.warning("Malware file not found: %s", self.file_path)
             self._ready = True
+            self._refresh_results()
             return
 
         try:
@@ -53,13 +86,16 @@ class FileLoader(BaseLoader):
             else:
                 await self._load_json()
 
+            self._ready = True
+            self._refresh_results()
             logger.info(
-                f"Loaded {len(self.malware_urls)} URLs from {self.file_path} "
-                f"({self.file_format.upper()})"
+                "Loaded %d URLs from %s (%s)",
+                self._size,
+                self.file_path,
+                self.file_format.upper(),
             )
-            self._ready = True
         except Exception as e:
-            logger.error(f"Failed to initialize {self.name}: {e}")
+            logger.error("Failed to initialize %s: %s", self.name, e)
             raise
 
     async def _load_csv(self) -> None:
@@ -67,38 +103,59 @@ class FileLoader(BaseLoader):
         async with aiofiles.open(self.file_path) as f:
             content = await f.read()
 
-        # Parse CSV in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        self.malware_urls = await loop.run_in_executor(None, self._parse_csv, content)
+        # Small files parse faster inline than the executor round-trip costs;
+        # larger ones are parsed in the executor to avoid blocking the event loop
+        if len(content) < INLINE_PARSE_MAX_CHARS:
+            parsed = self._parse_csv(content)
+        else:
+            loop = asyncio.get_running_loop()
+            parsed = await loop.run_in_executor(None, self._parse_csv, content)
+
+        self._index = parsed
+
+    def _parse_csv(self, content: str) -> dict[str, dict[int, set[str]]]:
+        """Parse CSV content (runs in executor for large files).
 
-    def _parse_csv(self, content: str) -> set[tuple[str, int, str]]:
-        """Parse CSV content (runs in executor)."""
-        urls = set()
-        reader = csv.DictReader(content.splitlines())
+        Returns:
+            Index mapping hostname -> port -> set of paths.
+        """
+        index: dict[str, dict[int, set[str]]] = {}
+
+        # Positional reader avoids allocating a dict per row; columns are located once
+        reader = csv.reader(io.StringIO(content))
+        header = next(reader, [])
+        if "hostname" not in header:
+            return index
+
+        hostname_idx = header.index("hostname")
+        port_idx = header.index("port") if "port" in header else None
+        path_idx = header.index("path") if "path" in header else None
 
         for row in reader:
-            if not row:
+            if len(row) <= hostname_idx:
                 continue
 
-            hostname = row.get("hostname", "").strip().lower()
-            try:
-                port = int(row.get("port", "80"))
-            except (ValueError, TypeError):
-                port = 80
+            hostname = sys.intern(row[hostname_idx].strip().lower())
+            port = _parse_port(
+                row[port_idx] if port_idx is not None and port_idx < len(row) else None
+            )
 
-            path = row.get("path", "/").strip() or "/"
+            path = (
+                row[path_idx].strip() if path_idx is not None and path_idx < len(row) else ""
+            ) or "/"
 
             if hostname:
-                urls.add((hostname, port, path))
+                index.setdefault(hostname, {}).setdefault(port, set()).add(path)
 
-        return urls
+        return index
 
     async def _load_json(self) -> None:
         """Load malware URLs from JSON file."""
-        async with aiofiles.open(self.file_path) as f:
+        # orjson parses raw bytes directly, skipping the str decode
+        async with aiofiles.open(self.file_path, mode="rb") as f:
             content = await f.read()
 
-        data = json.loads(content)
+        data = orjson.loads(content)
 
         # Handle different JSON structures
         if isinstance(data, list):
@@ -119,24 +176,21 @@ class FileLoader(BaseLoader):
             if not isinstance(entry, dict):
                 continue
 
-            hostname = entry.get("hostname", "").strip().lower()
-            try:
-                port = int(entry.get("port", "80"))
-            except (ValueError, TypeError):
-                port = 80
+            hostname = sys.intern(entry.get("hostname", "").strip().lower())
+            port = _parse_port(entry.get("port"))
 
             path = entry.get("path", "/").strip() or "/"
 
             if hostname:
-                self.malware_urls.add((hostname, port, path))
+                self._index.setdefault(hostname, {}).setdefault(port, set()).add(path)
 
-    async def lookup(self, hostname: str, port: int = 80, path: str = "/") -> ThreatInfo:
+    async def lookup(self, hostname: str, port: int = 80, path: str = "/") -> ThreatInfo:  # noqa: ARG002
         """Check if URL is in the malware database.
 
         Args:
             hostname: The hostname to check.
             port: The port number.
-            path: The URL path.
+            path: The URL path (any path matches a known hostname+port).
 
         Returns:
             ThreatInfo with is_malicious status.
@@ -149,29 +203,43 @@ class FileLoader(BaseLoader):
                 metadata={"error": "Loader not ready"},
             )
 
-        # Normalize inputs
-        hostname_normalized = hostname.lower().strip()
-        path_normalized = path.strip() or "/"
+        # Normalize inputs; str.strip() returns the same object when there is nothing
+        # to strip, so already-canonical hostnames are not copied
+        hostname_normalized = (hostname if hostname.islower() else hostname.lower()).strip()
 
-        # Check exact match
-        exact_match = (hostname_normalized, port, path_normalized) in self.malware_urls
+        # A known hostname+port matches with any path (more lenient matching), which
+        # subsumes the exact path match, so the path never needs probing
+        ports = self._index.get(hostname_normalized)
+        if ports is not None and port in ports:
+            return self._positive_result
+        return self._negative_result
 
-        # Check hostname+port with any path (more lenient matching)
-        hostname_port_match = any(
-            h == hostname_normalized and p == port for h, p, _ in self.malware_urls
-        )
-
-        is_malicious = exact_match or hostname_port_match
+    def _refresh_results(self) -> None:
+        """Rebuild the shared lookup results after the database is (re)loaded.
 
-        return ThreatInfo(
-            is_malicious=is_malicious,
-            threat_type="malware" if is_malicious else None,
-            threat_level="high" if is_malicious else "safe",
-            confidence_score=1.0 if is_malicious else 0.0,
+        The database is immutable once loaded, so a single ThreatInfo per outcome
+        is shared rather than allocating one per request. ThreatInfo is frozen and
+        the metadata is a read-only view, so no caller can alter what others see.
+        """
+        self._size = sum(len(paths) for ports in self._index.values() for paths in ports.values())
+        metadata = MappingProxyType({"database_size": self._size})
+        self._negative_result = ThreatInfo(
+            is_malicious=False,
+            threat_type=None,
+            threat_level="safe",
+            confidence_score=0.0,
+            detected_by=self.name,
+            metadata=metadata,
+        )
+        self._positive_result = ThreatInfo(
+            is_malicious=True,
+            threat_type="malware",
+            threat_level="high",
+            confidence_score=1.0,
             detected_by=self.name,
-            metadata={"database_size": len(self.malware_urls)},
+            metadata=metadata,
         )
 
     def get_database_size(self) -> int:
         """Get number of URLs in database."""
-        return len(self.malware_urls)
+        return self._size
@@ -1,27 +1,66 @@
 """HTTP endpoint-based malware database loader."""
 
+import asyncio
+import contextlib
+import socket
+from collections import Counter
+from collections.abc import AsyncIterator
+from typing import Any
+
 import httpx
+import orjson
 
 from src.services.database_loaders.base import BaseLoader, ThreatInfo
+from src.utils import metrics
 from src.utils.logging import get_logger
 
 # Constants
 SERVER_ERROR_CODE = 500
 SUCCESS_CODE = 200
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+DEFAULT_BATCH_WAIT_MS = 2.0
+DEFAULT_MAX_IN_FLIGHT = 64
+# Parallel HEADs sent at startup so the keepalive pool holds warm connections
+DEFAULT_WARMUP_CONNECTIONS = 2
+# Request bodies are serialized with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Lookups are tiny request/response pairs, so Nagle's algorithm only adds latency
+NODELAY_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
 
 logger = get_logger(__name__)
 
+# A queued batch-mode lookup: the (hostname, port, path) query and its caller's future
+_PendingLookup = tuple[tuple[str, int, str], asyncio.Future[ThreatInfo]]
+
+# Clients shared by loaders with identical client settings, with their reference counts
+_CLIENT_CACHE: dict[tuple[object, ...], httpx.AsyncClient] = {}
+_CLIENT_REFS: Counter[tuple[object, ...]] = Counter()
+
 
 class HTTPLoader(BaseLoader):
     """Query remote HTTP endpoints for malware URL information."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913 - pool tuning is keyword-only
         self,
         name: str,
         endpoint_url: str,
         method: str = "GET",
         timeout_seconds: float = 5.0,
         headers: dict[str, str] | None = None,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        http2: bool = True,
+        tcp_nodelay: bool = True,
+        max_batch: int = 0,
+        batch_wait_ms: float = DEFAULT_BATCH_WAIT_MS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
     ):
         """Initialize HTTP loader.
 
@@ -31,43 +70,141 @@ class HTTPLoader(BaseLoader):
             method: HTTP method (GET or POST).
             timeout_seconds: Request timeout.
             headers: Additional HTTP headers.
+            max_connections: Maximum concurrent connections to the endpoint.
+            max_keepalive_connections: Idle connections kept open for reuse.
+            keepalive_expiry: Seconds an idle connection is kept open.
+            http2: Whether to negotiate HTTP/2 with the endpoint.
+            tcp_nodelay: Whether to disable Nagle's algorithm on pooled sockets.
+            max_batch: Maximum lookups coalesced into one batch request; values
+                below 2 disable batching. Batches are always POSTed, whatever the
+                method.
+            batch_wait_ms: How long a batch waits for more lookups before it is sent.
+            max_in_flight: Maximum requests outstanding to the endpoint; further
+                lookups queue until a slot frees up.
         """
         super().__init__(name, timeout_seconds)
         self.endpoint_url = endpoint_url
         self.method = method.upper()
         self.headers = headers or {}
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.tcp_nodelay = tcp_nodelay
+        self.max_batch = max_batch
+        self.batch_wait_seconds = batch_wait_ms / 1000
+        self.max_in_flight = max_in_flight
         self.client: httpx.AsyncClient | None = None
+        # Queued (query, future) pairs drained by the batch worker when batching is on
+        self._pending: asyncio.Queue[_PendingLookup] | None = None
+        self._batch_task: asyncio.Task[None] | None = None
+        # Dispatched batches, held here so they are not garbage-collected mid-request
+        self._batch_requests: set[asyncio.Task[None]] = set()
+        self._warmup_task: asyncio.Task[None] | None = None
+        self._client_key: tuple[object, ...] | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._in_flight = 0
 
         if self.method not in ("GET", "POST"):
             msg = f"Unsupported HTTP method: {method}"
             raise ValueError(msg)
 
     async def initialize(self) -> None:
-        """Initialize HTTP client and test connectivity."""
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout_seconds,
-            headers=self.headers,
+        """Initialize HTTP client and test connectivity.
+
+        Calling this again on an initialized loader is a no-op, so the shared
+        client's reference count and background tasks are only set up once.
+        """
+        if self._client_key is not None:
+            return
+        # Loaders with the same settings share one pooled client, so they also share
+        # keepalive connections and TLS contexts to the endpoint host
+        self._client_key = (
+            self.timeout_seconds,
+            tuple(sorted(self.headers.items())),
+            self.limits.max_connections,
+            self.limits.max_keepalive_connections,
+            self.limits.keepalive_expiry,
+            self.http2,
+            self.tcp_nodelay,
         )
+        if self._client_key not in _CLIENT_CACHE:
+            transport = httpx.AsyncHTTPTransport(
+                limits=self.limits,
+                http2=self.http2,
+                socket_options=NODELAY_SOCKET_OPTIONS if self.tcp_nodelay else None,
+            )
+            _CLIENT_CACHE[self._client_key] = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                headers=self.headers,
+                transport=transport,
+            )
+        _CLIENT_REFS[self._client_key] += 1
+        self.client = _CLIENT_CACHE[self._client_key]
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
 
-        # Test connectivity
-        try:
-            response = await self.client.head(self.endpoint_url, timeout=self.timeout_seconds)
-            if response.status_code < SERVER_ERROR_CODE:
-                logger.info(f"HTTP loader {self.name} initialized: {self.endpoint_url}")
-                self._ready = True
-            else:
-                logger.warning(f"HTTP loader {self.name} returned status {response.status_code}")
-                self._ready = True
-        except Exception as e:
-            logger.warning(f"HTTP loader {self.name} connectivity check failed: {e}")
-            # Still mark as ready; may be temporarily unavailable
-            self._ready = True
+        # Connectivity is checked in the background so loaders don't serialize startup;
+        # an unreachable endpoint surfaces on the first real lookup instead
+        self._ready = True
+        self._warmup_task = asyncio.create_task(self._warmup())
+
+        if self.max_batch > 1:
+            self._pending = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_worker(self._pending))
+
+    async def _warmup(self) -> None:
+        """Test connectivity and pre-open pooled connections to the endpoint."""
+        client = self.client
+        if client is None:
+            return
+        # The client already carries timeout_seconds as its default timeout
+        responses = await asyncio.gather(
+            *(client.head(self.endpoint_url) for _ in range(DEFAULT_WARMUP_CONNECTIONS)),
+            return_exceptions=True,
+        )
+        response = responses[0]
+        if isinstance(response, BaseException):
+            logger.warning("HTTP loader %s connectivity check failed: %s", self.name, response)
+        elif response.status_code < SERVER_ERROR_CODE:
+            logger.info("HTTP loader %s initialized: %s", self.name, self.endpoint_url)
+        else:
+            logger.warning("HTTP loader %s returned status %d", self.name, response.status_code)
 
     async def shutdown(self) -> None:
-        """Close HTTP client."""
-        if self.client:
-            await self.client.aclose()
+        """Stop background tasks and close HTTP client."""
         self._ready = False
+        if self._warmup_task:
+            # Give an in-flight connectivity check one timeout window to finish
+            await asyncio.wait([self._warmup_task], timeout=self.timeout_seconds)
+            self._warmup_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._warmup_task
+            self._warmup_task = None
+        if self._batch_task:
+            self._batch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._batch_task
+            self._batch_task = None
+        for task in self._batch_requests:
+            task.cancel()
+        # Cancelled batches resolve their callers' futures as not ready
+        await asyncio.gather(*self._batch_requests, return_exceptions=True)
+        if self._pending:
+            while not self._pending.empty():
+                _, future = self._pending.get_nowait()
+                if not future.done():
+                    future.set_result(self._not_ready_result())
+            self._pending = None
+        if self._client_key is not None:
+            # The last loader using a shared client closes it
+            _CLIENT_REFS[self._client_key] -= 1
+            if _CLIENT_REFS[self._client_key] <= 0:
+                del _CLIENT_REFS[self._client_key]
+                await _CLIENT_CACHE.pop(self._client_key).aclose()
+            self._client_key = None
+        self.client = None
 
     async def lookup(self, hostname: str, port: int = 80, path: str = "/") -> ThreatInfo:
         """Query remote HTTP endpoint for URL status.
@@ -81,11 +218,12 @@ class HTTPLoader(BaseLoader):
             ThreatInfo with is_malicious status from endpoint.
         """
         if not self._ready or not self.client:
-            return ThreatInfo(
-                is_malicious=False,
-                detected_by=self.name,
-                metadata={"error": "Loader not ready"},
-            )
+            return self._not_ready_result()
+
+        if self._pending is not None:
+            future: asyncio.Future[ThreatInfo] = asyncio.get_running_loop().create_future()
+            self._pending.put_nowait(((hostname, port, path), future))
+            return await future
 
         try:
             # Build query URL
@@ -95,24 +233,19 @@ class HTTPLoader(BaseLoader):
                 "path": path,
             }
 
-            if self.method == "GET":
-                response = await self.client.get(
-                    self.endpoint_url,
-                    params=query_params,
-                    timeout=self.timeout_seconds,
-                )
-            else:  # POST
-                response = await self.client.post(
-                    self.endpoint_url,
-                    json=query_params,
-                    timeout=self.timeout_seconds,
-                )
+            async with self._request_slot():
+                if self.method == "GET":
+                    response = await self.client.get(self.endpoint_url, params=query_params)
+                else:  # POST
+                    response = await self.client.post(
+                        self.endpoint_url, content=orjson.dumps(query_params), headers=JSON_HEADERS
+                    )
 
             if response.status_code == SUCCESS_CODE:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return self._parse_response(data)
 
-            logger.warning(f"HTTP loader {self.name} returned status {response.status_code}")
+            logger.warning("HTTP loader %s returned status %d", self.name, response.status_code)
             return ThreatInfo(
                 is_malicious=False,
                 detected_by=self.name,
@@ -120,20 +253,157 @@ class HTTPLoader(BaseLoader):
             )
 
         except httpx.TimeoutException:
-            logger.error(f"HTTP loader {self.name} timeout")
+            logger.error("HTTP loader %s timeout", self.name)
             return ThreatInfo(
                 is_malicious=False,
                 detected_by=self.name,
                 metadata={"error": "timeout"},
             )
         except Exception as e:
-            logger.error(f"HTTP loader {self.name} query failed: {e}")
+            logger.error("HTTP loader %s query failed: %s", self.name, e)
             return ThreatInfo(
                 is_malicious=False,
                 detected_by=self.name,
                 metadata={"error": str(e)},
             )
 
+    async def lookup_many(self, queries: list[tuple[str, int, str]]) -> list[ThreatInfo]:
+        """Query remote HTTP endpoint for several URLs in one round trip.
+
+        POSTs {"queries": [{"hostname", "port", "path"}, ...]} and expects a list of
+        results in the same order, either bare or under a "results" key.
+
+        Args:
+            queries: (hostname, port, path) tuples to check.
+
+        Returns:
+            One ThreatInfo per query, in query order.
+        """
+        if not self._ready or not self.client:
+            return [self._not_ready_result() for _ in queries]
+
+        metadata: dict[str, Any]
+        payload = {
+            "queries": [
+                {"hostname": hostname, "port": port, "path": path}
+                for hostname, port, path in queries
+            ]
+        }
+
+        try:
+            async with self._request_slot():
+                response = await self.client.post(
+                    self.endpoint_url, content=orjson.dumps(payload), headers=JSON_HEADERS
+                )
+
+            if response.status_code == SUCCESS_CODE:
+                data = orjson.loads(response.content)
+                results = data.get("results", []) if isinstance(data, dict) else data
+                if len(results) == len(queries):
+                    return [self._parse_response(item) for item in results]
+                metadata = {"error": f"expected {len(queries)} results, got {len(results)}"}
+            else:
+                metadata = {"http_status": response.status_code}
+
+            logger.warning("HTTP loader %s batch lookup failed: %s", self.name, metadata)
+            return [
+                ThreatInfo(is_malicious=False, detected_by=self.name, metadata=metadata)
+                for _ in queries
+            ]
+
+        except httpx.TimeoutException:
+            logger.error("HTTP loader %s batch timeout", self.name)
+            metadata = {"error": "timeout"}
+        except Exception as e:
+            logger.error("HTTP loader %s batch query failed: %s", self.name, e)
+            metadata = {"error": str(e)}
+
+        return [
+            ThreatInfo(is_malicious=False, detected_by=self.name, metadata=metadata)
+            for _ in queries
+        ]
+
+    @contextlib.asynccontextmanager
+    async def _request_slot(self) -> AsyncIterator[None]:
+        """Hold one of the max_in_flight request slots for the enclosed request.
+
+        Bursts queue here instead of exhausting the endpoint's connection pool; the
+        in-flight count is kept as a gauge (a request count, not a duration) so
+        operators can tune the limit.
+
+        Raises:
+            RuntimeError: If the loader has not been initialized.
+        """
+        semaphore = self._semaphore
+        if semaphore is None:
+            msg = f"HTTP loader {self.name} is not initialized"
+            raise RuntimeError(msg)
+        async with semaphore:
+            self._in_flight += 1
+            metrics.gauge("http_loader.inflight", self._in_flight)
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+                metrics.gauge("http_loader.inflight", self._in_flight)
+
+    async def _batch_worker(self, pending: asyncio.Queue[_PendingLookup]) -> None:
+        """Coalesce lookups queued on pending into batch requests until cancelled.
+
+        Each batch is sent from its own task, so the next batch is collected while
+        earlier ones are still in flight; _request_slot bounds how many run at once.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await pending.get()]
+            deadline = loop.time() + self.batch_wait_seconds
+            try:
+                # Collect until the batch is full or the wait window closes
+                while len(batch) < self.max_batch:
+                    if not pending.empty():
+                        batch.append(pending.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(pending.get(), remaining))
+                    except TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._release_batch(batch)
+                raise
+
+            task = asyncio.create_task(self._send_batch(batch))
+            self._batch_requests.add(task)
+            task.add_done_callback(self._batch_requests.discard)
+
+    async def _send_batch(self, batch: list[_PendingLookup]) -> None:
+        """Send one collected batch and resolve its callers' futures."""
+        try:
+            results = await self.lookup_many([query for query, _ in batch])
+            for (_, future), result in zip(batch, results, strict=True):
+                # Callers that timed out have already cancelled their future
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            # Never leave a caller waiting if the batch is cancelled mid-request
+            self._release_batch(batch)
+
+    def _release_batch(self, batch: list[_PendingLookup]) -> None:
+        """Resolve any still-pending futures in batch as not ready."""
+        for _, future in batch:
+            if not future.done():
+                future.set_result(self._not_ready_result())
+
+    def _not_ready_result(self) -> ThreatInfo:
+        """Build the result returned when the loader cannot serve lookups."""
+        return ThreatInfo(
+            is_malicious=False,
+            detected_by=self.name,
+            metadata={"error": "Loader not ready"},
+        )
+
     def _parse_response(self, data: dict) -> ThreatInfo:
         """Parse HTTP response into ThreatInfo.
 
@@ -143,17 +413,25 @@ class HTTPLoader(BaseLoader):
         Returns:
             ThreatInfo object.
         """
-        # Support multiple response formats
-        is_malicious = data.get(
-            "is_malicious",
-            data.get("malicious", data.get("threat_detected", False)),
+        # Support multiple response formats, probing aliases in order of precedence;
+        # defaults are only computed when the canonical key is absent
+        is_malicious = (
+            data["is_malicious"]
+            if "is_malicious" in data
+            else data["malicious"]
+            if "malicious" in data
+            else data.get("threat_detected", False)
         )
-        threat_type = data.get("threat_type", data.get("type"))
-        threat_level = data.get(
-            "threat_level", data.get("level", "safe" if not is_malicious else "medium")
+        threat_type = data["threat_type"] if "threat_type" in data else data.get("type")
+        threat_level = (
+            data["threat_level"]
+            if "threat_level" in data
+            else data.get("level", "medium" if is_malicious else "safe")
         )
-        confidence = data.get(
-            "confidence_score", data.get("confidence", 1.0 if is_malicious else 0.0)
+        confidence = (
+            data["confidence_score"]
+            if "confidence_score" in data
+            else data.get("confidence", 1.0 if is_malicious else 0.0)
         )
 
         return ThreatInfo(
@@ -2,6 +2,7 @@
 
 import asyncio
 import time
+from typing import Any
 
 from src.models.malware_db import LoaderStatistics
 from src.services.database_loaders.base import BaseLoader, ThreatInfo
@@ -29,16 +30,16 @@ class MalwareChecker:
 
     async def initialize(self) -> None:
         """Initialize all loaders (called at app startup)."""
-        logger.info(f"Initializing {len(self.loaders)} malware database loaders...")
+        logger.info("Initializing %d malware database loaders...", len(self.loaders))
 
         tasks = [loader.initialize() for loader in self.loaders]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         for loader, result in zip(self.loaders, results, strict=True):
             if isinstance(result, Exception):
-                logger.error(f"Failed to initialize {loader.name}: {result}")
+                logger.error("Failed to initialize %s: %s", loader.name, result)
             else:
-                logger.info(f"Initialized {loader.name}: {loader.is_ready()}")
+                logger.info("Initialized %s: %s", loader.name, loader.is_ready())
 
     async def shutdown(self) -> None:
         """Shutdown all loaders (called at app shutdown)."""
@@ -49,7 +50,7 @@ class MalwareChecker:
 
     async def check_url(
         self, hostname: str, port: int = 80, path: str = "/"
-    ) -> tuple[bool, list[str], dict]:
+    ) -> tuple[bool, list[str], dict[str, Any]]:
         """Check if URL is malicious across all databases.
 
         Args:
@@ -63,18 +64,43 @@ class MalwareChecker:
         # Construct cache key
         cache_key = f"{hostname}:{port}{path}"
 
-        # Check cache first
-        if self.cache_enabled:
-            cached_result = url_cache.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for {cache_key}: {cached_result}")
-                return cached_result, [], {"cached": True}
+        if not self.cache_enabled:
+            return await self._query_loaders(cache_key, hostname, port, path)
 
+        # Concurrent misses for the same URL share one fan-out to the loaders
+        async def compute() -> tuple[bool, tuple[list[str], dict[str, Any]]]:
+            is_malicious, databases_queried, details = await self._query_loaders(
+                cache_key, hostname, port, path
+            )
+            return is_malicious, (databases_queried, details)
+
+        is_malicious, fresh = await url_cache.getset_if_absent(cache_key, compute)
+        if fresh is not None:
+            databases_queried, details = fresh
+            return is_malicious, databases_queried, details
+
+        logger.debug("Cache hit for %s: %s", cache_key, is_malicious)
+        return is_malicious, [], {"cached": True}
+
+    async def _query_loaders(
+        self, cache_key: str, hostname: str, port: int, path: str
+    ) -> tuple[bool, list[str], dict[str, Any]]:
+        """Query all loaders in parallel and aggregate their results.
+
+        Args:
+            cache_key: The URL key, used for logging.
+            hostname: The hostname to check.
+            port: The port number.
+            path: The URL path.
+
+        Returns:
+            Tuple of (is_malicious, databases_queried, result_details).
+        """
         # Query all loaders in parallel
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         loader_tasks = [self._query_loader(loader, hostname, port, path) for loader in self.loaders]
         loader_results = await asyncio.gather(*loader_tasks, return_exceptions=True)
-        elapsed_ms = (time.time() - start_time) * 1000
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
         # Process results
         is_malicious = False
@@ -83,7 +109,7 @@ class MalwareChecker:
 
         for loader, result in zip(self.loaders, loader_results, strict=True):
             if isinstance(result, Exception):
-                logger.error(f"Error querying {loader.name}: {result}")
+                logger.error("Error querying %s: %s", loader.name, result)
                 self.statistics[loader.name].failed_queries += 1
                 continue
 
@@ -102,18 +128,17 @@ class MalwareChecker:
                 }
                 self.statistics[loader.name].malicious_urls_found += 1
 
-        # Cache the result
-        if self.cache_enabled:
-            url_cache.set(cache_key, is_malicious)
-
         # Update statistics
         for stats in self.statistics.values():
             if stats.total_queries > 0:
                 stats.avg_response_time_ms = elapsed_ms / len(self.loaders)
 
         logger.info(
-            f"URL check: {cache_key} -> is_malicious={is_malicious}, "
-            f"databases={databases_queried}, response_time={elapsed_ms:.2f}ms"
+            "URL check: %s -> is_malicious=%s, databases=%s, response_time=%.2fms",
+            cache_key,
+            is_malicious,
+            databases_queried,
+            elapsed_ms,
         )
 
         result_details = {
@@ -144,13 +169,19 @@ class MalwareChecker:
                 timeout=loader.timeout_seconds,
             )
         except TimeoutError:
-            logger.warning(f"{loader.name} lookup timed out")
+            logger.warning("%s lookup timed out", loader.name)
             return ThreatInfo(
                 is_malicious=False,
                 detected_by=loader.name,
                 metadata={"error": "timeout"},
             )
 
+    def reset_statistics(self) -> None:
+        """Clear per-loader query statistics, keeping loaders initialized."""
+        self.statistics = {
+            loader.name: LoaderStatistics(name=loader.name) for loader in self.loaders
+        }
+
     def get_statistics(self) -> dict[str, LoaderStatistics]:
         """Get statistics for all loaders."""
         return self.statistics
@@ -166,7 +197,7 @@ class MalwareChecker:
         """Check if any loader is ready."""
         return any(loader.is_ready() for loader in self.loaders)
 
-    def get_status(self) -> dict:
+    def get_status(self) -> dict[str, Any]:
         """Get current status of all loaders."""
         return {
             "ready": self.is_ready(),
@@ -180,4 +211,5 @@ class MalwareChecker:
             ],
             "cache_enabled": self.cache_enabled,
             "cache_size": url_cache.size(),
+            "cache_hot_keys": url_cache.hot_keys(),
         }
@@ -1,7 +1,13 @@
 """URL validation and normalization service."""
 
-from urllib.parse import ParseResult, urlparse
-
+import re
+import socket
+import string
+import sys
+from functools import lru_cache
+from typing import NamedTuple
+
+from src.config import settings
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -9,11 +15,50 @@ logger = get_logger(__name__)
 # Constants
 MAX_URL_LENGTH = 2048
 MIN_URL_LENGTH = 10
-VALID_SCHEMES = {"http", "https"}
-MAX_HOSTNAME_NUMBER = 255
-PARTS_IPV4_HOSTNAME = 4
+VALID_SCHEMES = frozenset(("http", "https"))
 MIN_PARTS_IPV4_HOSTNAME = 2
-MAX_ASCII_VALUE = 127
+MAX_PORT = 65535
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Single C-level match splitting scheme, netloc, path, query and fragment
+_URL_RE = re.compile(r"^(https?)://([^/?#]*)([^?#]*)(?:\?([^#]*))?(?:#(.*))?$", re.DOTALL)
+# Deletes every valid ASCII hostname character; whatever survives needs a closer look
+_DELETE_VALID_HOSTNAME_CHARS = str.maketrans("", "", string.ascii_lowercase + string.digits + ".-:")
+# Tab and newline characters are removed anywhere in a URL, as urllib.parse does
+_DELETE_UNSAFE_URL_CHARS = str.maketrans("", "", "\t\r\n")
+
+
+class _URLParts(NamedTuple):
+    """Components of a validated URL."""
+
+    scheme: str
+    hostname: str
+    port: int | None
+    path: str
+    query: str
+    fragment: str
+
+
+@lru_cache(maxsize=settings.cache_max_entries)
+def _validate_cached(url: str) -> tuple[str, _URLParts] | str:
+    """Validate and parse a URL, memoizing failures as well as successes.
+
+    Failures are cached as the error message (not the exception instance) so a
+    fresh ValueError without an ever-growing traceback is raised on each hit.
+
+    Args:
+        url: The URL to validate.
+
+    Returns:
+        Tuple of (normalized URL, components), or the error message if invalid.
+    """
+    try:
+        parts = URLValidator._parse(url)
+    except ValueError as e:
+        return str(e)
+    normalized = URLValidator._reconstruct_url(parts)
+    # Already-canonical input is cached as itself rather than as an equal copy
+    return (url if normalized == url else normalized), parts
 
 
 class URLValidator:
@@ -37,6 +82,22 @@ class URLValidator:
         Raises:
             ValueError: If URL is invalid with descriptive message.
         """
+        return URLValidator._validate_and_parse(url)[0]
+
+    @staticmethod
+    def _validate_and_parse(url: str) -> tuple[str, _URLParts]:
+        """Validate a URL once and return both its normalized form and components.
+
+        Args:
+            url: The URL to validate.
+
+        Returns:
+            Tuple of (normalized URL, components).
+
+        Raises:
+            ValueError: If URL is invalid with descriptive message.
+        """
+        # Type checks run first so unhashable input never reaches the cache
         if not url:
             msg = "URL cannot be empty"
             raise ValueError(msg)
@@ -45,13 +106,31 @@ class URLValidator:
             msg = "URL must be a string"
             raise ValueError(msg)
 
+        result = _validate_cached(url)
+        if isinstance(result, str):
+            raise ValueError(result)
+        return result
+
+    @staticmethod
+    def _parse(url: str) -> _URLParts:
+        """Validate a URL and split it into components.
+
+        Args:
+            url: The URL to parse (scheme optional).
+
+        Returns:
+            The URL components with a lowercased hostname.
+
+        Raises:
+            ValueError: If URL is invalid with descriptive message.
+        """
         # Check length
-        if len(url) < URLValidator.MIN_URL_LENGTH:
-            msg = f"URL too short (minimum {URLValidator.MIN_URL_LENGTH} characters)"
+        if len(url) < MIN_URL_LENGTH:
+            msg = f"URL too short (minimum {MIN_URL_LENGTH} characters)"
             raise ValueError(msg)
 
-        if len(url) > URLValidator.MAX_URL_LENGTH:
-            msg = f"URL exceeds maximum length of {URLValidator.MAX_URL_LENGTH}"
+        if len(url) > MAX_URL_LENGTH:
+            msg = f"URL exceeds maximum length of {MAX_URL_LENGTH}"
             raise ValueError(msg)
 
         # Add scheme if missing
@@ -64,31 +143,65 @@ class URLValidator:
                 msg = "URL must use http:// or https:// scheme"
                 raise ValueError(msg)
 
-        # Parse URL
-        try:
-            parsed = urlparse(url_to_parse)
-        except Exception as e:
-            msg = f"Invalid URL format: {e}"
-            raise ValueError(msg) from e
-
-        # Validate scheme
-        if parsed.scheme not in URLValidator.VALID_SCHEMES:
-            msg = f"Invalid scheme '{parsed.scheme}'. Must be http or https."
+        match = _URL_RE.match(url_to_parse.translate(_DELETE_UNSAFE_URL_CHARS))
+        if not match:
+            msg = "Invalid URL format"
             raise ValueError(msg)
+        scheme, netloc, path, query, fragment = match.groups()
+
+        hostname, port = URLValidator._split_netloc(netloc)
 
         # Validate hostname
-        if not parsed.hostname:
+        if not hostname:
             msg = "URL must include a hostname/domain"
             raise ValueError(msg)
 
         # Validate hostname format (basic check)
-        hostname = parsed.hostname.lower()
+        hostname = hostname.lower()
         if not URLValidator._is_valid_hostname(hostname):
             msg = f"Hostname '{hostname}' is not valid."
             raise ValueError(msg)
 
-        # Reconstruct normalized URL
-        return URLValidator._reconstruct_url(parsed)
+        # Hosts repeat across many cached URLs; interning keeps one copy of each
+        return _URLParts(
+            sys.intern(scheme), sys.intern(hostname), port, path, query or "", fragment or ""
+        )
+
+    @staticmethod
+    def _split_netloc(netloc: str) -> tuple[str, int | None]:
+        """Split a netloc into hostname and port, dropping any userinfo.
+
+        Args:
+            netloc: The network location part of a URL.
+
+        Returns:
+            Tuple of (hostname, port), with port None if absent. The brackets of an
+            IPv6 literal are removed.
+
+        Raises:
+            ValueError: If the port is not a number in range, or a bracketed host
+                is not an IPv6 address.
+        """
+        host_port = netloc.rpartition("@")[2]
+        if host_port.startswith("["):
+            # Colons inside the brackets belong to the address, not the port
+            hostname, _, rest = host_port[1:].partition("]")
+            if ":" not in hostname or not URLValidator._is_valid_ip(hostname):
+                msg = f"Invalid IPv6 address '{hostname}'"
+                raise ValueError(msg)
+            if rest and not rest.startswith(":"):
+                msg = f"Invalid port '{rest}'"
+                raise ValueError(msg)
+            port_str = rest[1:]
+        else:
+            # Split at the first colon so a second one lands in the port and fails
+            hostname, _, port_str = host_port.partition(":")
+        if not port_str:
+            return hostname, None
+        if not (port_str.isascii() and port_str.isdigit()) or int(port_str) > MAX_PORT:
+            msg = f"Invalid port '{port_str}'"
+            raise ValueError(msg)
+        return hostname, int(port_str)
 
     @staticmethod
     def _is_valid_hostname(hostname: str) -> bool:
@@ -109,7 +222,9 @@ class URLValidator:
             return True
 
         # Check for valid characters (alphanumeric, hyphens, dots, and non-ASCII for IDN)
-        if not all(c.isalnum() or c in ".-:" or ord(c) > MAX_ASCII_VALUE for c in hostname):
+        # with one C-level pass: only non-ASCII (IDN) characters may survive deletion
+        residue = hostname.translate(_DELETE_VALID_HOSTNAME_CHARS)
+        if residue and residue.encode("ascii", "ignore"):
             return False
 
         # Must have at least 2 parts separated by dot (or be localhost/IP)
@@ -123,46 +238,40 @@ class URLValidator:
 
     @staticmethod
     def _is_valid_ip(ip_string: str) -> bool:
-        """Check if string is valid IPv4 address.
+        """Check if string is a valid IP address.
 
         Args:
             ip_string: The IP string to check.
 
         Returns:
-            True if valid IPv4, False otherwise.
+            True if valid IPv4 (or IPv6), False otherwise.
         """
-        parts = ip_string.split(".")
-        if len(parts) != PARTS_IPV4_HOSTNAME:
+        # inet_pton only accepts full dotted quads, unlike inet_aton's shorthand forms
+        family = socket.AF_INET6 if ":" in ip_string else socket.AF_INET
+        try:
+            socket.inet_pton(family, ip_string)
+        except OSError:
             return False
-
-        for part in parts:
-            try:
-                num = int(part)
-                if num < 0 or num > MAX_HOSTNAME_NUMBER:
-                    return False
-            except ValueError:
-                return False
-
         return True
 
     @staticmethod
-    def _reconstruct_url(parsed: ParseResult) -> str:
+    def _reconstruct_url(parsed: _URLParts) -> str:
         """Reconstruct normalized URL from parsed components.
 
         Args:
-            parsed: ParseResult from urlparse.
+            parsed: Components from _parse.
 
         Returns:
             Normalized URL string.
         """
-        scheme = parsed.scheme or "https"
-        hostname = (parsed.hostname or "").lower()
+        scheme = parsed.scheme
+        hostname = parsed.hostname
         port = parsed.port
 
         # Construct netloc
-        netloc = hostname
+        netloc = f"[{hostname}]" if ":" in hostname else hostname
         if port and not URLValidator._is_default_port(scheme, port):
-            netloc = f"{hostname}:{port}"
+            netloc = f"{netloc}:{port}"
 
         # Construct path and query
         path = parsed.path or "/"
@@ -183,8 +292,7 @@ class URLValidator:
         Returns:
             True if port is default for scheme.
         """
-        default_ports = {"http": 80, "https": 443}
-        return port == default_ports.get(scheme)
+        return port == _DEFAULT_PORTS.get(scheme)
 
     @staticmethod
     def extract_hostname_and_port(url: str) -> tuple[str, int]:
@@ -199,11 +307,10 @@ class URLValidator:
         Raises:
             ValueError: If URL is invalid.
         """
-        normalized = URLValidator.validate(url)
-        parsed = urlparse(normalized)
+        parsed = URLValidator._validate_and_parse(url)[1]
 
-        hostname = parsed.hostname or "localhost"
-        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        hostname = parsed.hostname
+        port = parsed.port or _DEFAULT_PORTS[parsed.scheme]
 
         return hostname, port
 
@@ -220,8 +327,7 @@ class URLValidator:
         Raises:
             ValueError: If URL is invalid.
         """
-        normalized = URLValidator.validate(url)
-        parsed = urlparse(normalized)
+        parsed = URLValidator._validate_and_parse(url)[1]
 
         path = parsed.path or "/"
         query_string = f"?{parsed.query}" if parsed.query else ""
@@ -1,8 +1,251 @@
 """TTL-based in-memory caching utility for URL lookup results."""
 
-from cachetools import TTLCache
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
 
 from src.config import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Constants
+DEFAULT_SHARDS = 16
+NS_PER_SECOND = 1_000_000_000
+SKETCH_DEPTH = 4
+SKETCH_MIN_WIDTH = 64
+SKETCH_MAX_COUNT = 15
+SKETCH_RESET_FACTOR = 10
+# Accesses within one sample period that make a key count towards the hot set
+HOT_KEY_THRESHOLD = 2
+# Capacity is reported as oversized when the hot set fills less than 1/N of it
+OVERSIZED_CAPACITY_RATIO = 4
+# Reads are buffered and recorded in the sketch in batches of this size
+READ_BUFFER_SIZE = 64
+_HASH_MASK = (1 << 64) - 1
+
+
+class FrequencySketch:
+    """Count-min sketch estimating how often keys were recently accessed.
+
+    Each key maps to SKETCH_DEPTH counters in one shared table. Counters saturate at
+    SKETCH_MAX_COUNT and are all halved once the number of recorded accesses reaches
+    SKETCH_RESET_FACTOR times the expected key count, so the estimates favour recent
+    popularity over all-time totals (the TinyLFU scheme).
+
+    Keys read while their estimate is at least HOT_KEY_THRESHOLD are also marked in
+    a bitmap, and each sample period's distinct count is derived from the fraction
+    of bits still clear (linear counting). This approximates the working set size
+    and is exposed as hot_keys once the first period completes.
+    """
+
+    def __init__(self, width: int) -> None:
+        """Initialize the sketch.
+
+        Args:
+            width: Expected number of distinct hot keys.
+        """
+        width = max(width, SKETCH_MIN_WIDTH)
+        size = SKETCH_MIN_WIDTH
+        while size < width * SKETCH_DEPTH:
+            size *= 2
+        self._mask = size - 1
+        self._table = [0] * size
+        self._additions = 0
+        self._reset_at = width * SKETCH_RESET_FACTOR
+        self._hot_bits = bytearray(size)
+        self._hot_marked = 0
+        self.hot_keys: int | None = None
+
+    def _hash(self, key: Any) -> tuple[int, int]:
+        """First counter position and probe step for key (double hashing)."""
+        h = hash(key) & _HASH_MASK
+        return h & self._mask, (h >> 32) | 1
+
+    def increment(self, key: Any) -> bool:
+        """Record one access to key.
+
+        Returns:
+            True if this access completed a sample period and updated hot_keys.
+        """
+        table, mask = self._table, self._mask
+        first, step = self._hash(key)
+        estimate = SKETCH_MAX_COUNT
+        for i in range(SKETCH_DEPTH):
+            index = (first + i * step) & mask
+            count = table[index]
+            if count < SKETCH_MAX_COUNT:
+                table[index] = count = count + 1
+            estimate = min(estimate, count)
+        if estimate >= HOT_KEY_THRESHOLD and not self._hot_bits[first]:
+            self._hot_bits[first] = 1
+            self._hot_marked += 1
+        self._additions += 1
+        if self._additions < self._reset_at:
+            return False
+        self._table = [count >> 1 for count in table]
+        self._additions >>= 1
+        size = len(table)
+        clear = size - self._hot_marked
+        self.hot_keys = size if clear == 0 else round(size * math.log(size / clear))
+        self._hot_bits = bytearray(size)
+        self._hot_marked = 0
+        return True
+
+    def frequency(self, key: Any) -> int:
+        """Estimated recent access count for key."""
+        table, mask = self._table, self._mask
+        first, step = self._hash(key)
+        return min(table[(first + i * step) & mask] for i in range(SKETCH_DEPTH))
+
+
+class ShardedTTLCache:
+    """LRU cache with per-entry TTL, split into hash-selected shards.
+
+    Each shard is an OrderedDict of key -> (expiry_ns, value); expired entries are
+    dropped lazily when read. Capacity is global, so any working set up to maxsize
+    fits; when full, the least recently used entry of the target shard is evicted.
+    Intended for use from the event loop thread, so no locking is done.
+
+    With admission enabled, reads are buffered and recorded in a FrequencySketch in
+    batches, and offer() only lets a new key displace the LRU victim if it has been
+    requested at least as often, so a scan of one-off keys cannot flush a hot working
+    set. Plain assignment always stores.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, shards: int = DEFAULT_SHARDS, *, admission: bool = False
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries across all shards.
+            ttl: Time-to-live in seconds for cache entries.
+            shards: Requested number of shards; rounded down to a power of two.
+            admission: Track access frequency so offer() can filter new keys once
+                the cache is full.
+        """
+        count = 1
+        while count * 2 <= shards:
+            count *= 2
+        self._mask = count - 1
+        self._shards: list[OrderedDict[Any, tuple[int, Any]]] = [
+            OrderedDict() for _ in range(count)
+        ]
+        self._len = 0
+        self.maxsize = maxsize
+        self.ttl_ns = int(ttl * NS_PER_SECOND)
+        self._sketch = FrequencySketch(maxsize) if admission else None
+        self._reads: list[Any] | None = [] if admission else None
+        self._oversized = False
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        reads = self._reads
+        if reads is not None:
+            reads.append(key)
+            if len(reads) >= READ_BUFFER_SIZE:
+                self._drain_reads()
+        shard = self._shards[hash(key) & self._mask]
+        entry = shard.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic_ns():
+            del shard[key]
+            self._len -= 1
+            return default
+        shard.move_to_end(key)
+        return entry[1]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Cache value under key, evicting a least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        shard = self._shards[hash(key) & self._mask]
+        if key in shard:
+            shard.move_to_end(key)
+        elif self._len >= self.maxsize:
+            # Prefer the target shard; fall back to any shard holding entries
+            victim = shard or next(s for s in self._shards if s)
+            victim.popitem(last=False)
+        else:
+            self._len += 1
+        shard[key] = (time.monotonic_ns() + self.ttl_ns, value)
+
+    def offer(self, key: Any, value: Any) -> bool:
+        """Cache value under key unless the admission filter rejects it.
+
+        Without admission, or while the cache has room, this is plain assignment.
+
+        Returns:
+            True if the value was stored.
+        """
+        sketch = self._sketch
+        if sketch is not None and self._len >= self.maxsize > 0:
+            shard = self._shards[hash(key) & self._mask]
+            if key not in shard:
+                self._drain_reads()
+                victim = shard or next(s for s in self._shards if s)
+                if not self._admit(sketch, key, victim):
+                    return False
+        self[key] = value
+        return True
+
+    @staticmethod
+    def _admit(
+        sketch: FrequencySketch, key: Any, victim: OrderedDict[Any, tuple[int, Any]]
+    ) -> bool:
+        """Whether key should replace the least recently used entry of victim."""
+        victim_key, (expiry_ns, _) = next(iter(victim.items()))
+        if expiry_ns <= time.monotonic_ns():
+            return True
+        return sketch.frequency(key) >= sketch.frequency(victim_key)
+
+    def _drain_reads(self) -> None:
+        """Record buffered reads in the frequency sketch."""
+        sketch, reads = self._sketch, self._reads
+        if sketch is None or not reads:
+            return
+        for key in reads:
+            if sketch.increment(key):
+                self._check_capacity(sketch)
+        reads.clear()
+
+    def _check_capacity(self, sketch: FrequencySketch) -> None:
+        """Log when the observed hot set moves well below capacity, or back."""
+        hot = sketch.hot_keys or 0
+        oversized = hot * OVERSIZED_CAPACITY_RATIO < self.maxsize
+        if oversized and not self._oversized:
+            logger.info(
+                "Cache hot set is about %d keys, under 1/%d of its %d-entry capacity; "
+                "CACHE_MAX_ENTRIES could be lowered",
+                hot,
+                OVERSIZED_CAPACITY_RATIO,
+                self.maxsize,
+            )
+        elif self._oversized and not oversized:
+            logger.info("Cache hot set grew to about %d keys of %d", hot, self.maxsize)
+        self._oversized = oversized
+
+    @property
+    def hot_keys(self) -> int | None:
+        """Approximate working set size, or None until it has been measured."""
+        return self._sketch.hot_keys if self._sketch is not None else None
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for shard in self._shards:
+            shard.clear()
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones not yet evicted."""
+        return self._len
 
 
 class URLCache:
@@ -15,8 +258,12 @@ class URLCache:
             maxsize: Maximum number of entries in the cache.
             ttl: Time-to-live in seconds for cache entries.
         """
-        self.cache: TTLCache[str, bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.cache = ShardedTTLCache(
+            maxsize=maxsize, ttl=ttl, admission=settings.cache_admission_filter
+        )
         self.enabled = settings.cache_enabled
+        # Pending computations per URL, shared by concurrent misses
+        self._in_flight: dict[str, asyncio.Future[Any]] = {}
 
     def get(self, url: str) -> bool | None:
         """Get a cached result for a URL.
@@ -30,10 +277,8 @@ class URLCache:
         if not self.enabled:
             return None
 
-        try:
-            return self.cache.get(url)
-        except KeyError:
-            return None
+        cached: bool | None = self.cache.get(url)
+        return cached
 
     def set(self, url: str, is_malicious: bool) -> None:
         """Cache a URL lookup result.
@@ -45,11 +290,56 @@ class URLCache:
         if not self.enabled:
             return
 
+        self.cache[url] = is_malicious
+
+    async def getset_if_absent(
+        self, url: str, compute: Callable[[], Awaitable[tuple[bool, T]]]
+    ) -> tuple[bool, T | None]:
+        """Get a cached result, computing and caching it on a miss.
+
+        Concurrent misses for the same URL wait for a single computation instead of
+        each querying the databases. If that computation fails or is cancelled, the
+        waiters retry rather than inherit its failure. Computed results are stored
+        through the admission filter, so one-off URLs cannot evict frequently read ones.
+
+        Args:
+            url: The normalized URL to look up in cache.
+            compute: Coroutine function producing (is_malicious, details) on a miss;
+                only is_malicious is cached.
+
+        Returns:
+            Tuple of (is_malicious, details). details is what compute returned, for
+            the caller whose compute ran and for callers that waited on it, or None
+            when the result came from the cache.
+        """
+        if not self.enabled:
+            return await compute()
+
+        while True:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached, None
+            pending = self._in_flight.get(url)
+            if pending is None:
+                break
+            await asyncio.wait([pending])
+            if not pending.cancelled():
+                shared: tuple[bool, T] = pending.result()
+                return shared
+
+        future: asyncio.Future[tuple[bool, T]] = asyncio.get_running_loop().create_future()
+        self._in_flight[url] = future
         try:
-            self.cache[url] = is_malicious
-        except (KeyError, ValueError):
-            # Cache full or other error; skip
-            pass
+            result = await compute()
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            self.cache.offer(url, result[0])
+            future.set_result(result)
+        finally:
+            del self._in_flight[url]
+        return result
 
     def clear(self) -> None:
         """Clear all cached entries."""
@@ -59,6 +349,10 @@ class URLCache:
         """Get the current number of entries in the cache."""
         return len(self.cache)
 
+    def hot_keys(self) -> int | None:
+        """Get the approximate number of frequently requested URLs, if measured."""
+        return self.cache.hot_keys
+
 
 # Global cache instance
 url_cache = URLCache(maxsize=settings.cache_max_entries, ttl=settings.cache_ttl_seconds)
@@ -53,6 +53,10 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+# Logger for the log_* helpers below, resolved once rather than on every call
+_logger = get_logger(__name__)
+
+
 def generate_request_id() -> str:
     """Generate a unique request ID for correlation."""
     return f"req-{uuid.uuid4().hex[:12]}"
@@ -76,23 +80,26 @@ def log_url_lookup(
     cached: bool = False,
 ) -> None:
     """Log a URL lookup operation with full context."""
-    logger = get_logger(__name__)
-    logger.info(
-        f"URL lookup: url={url}, is_malicious={is_malicious}, "
-        f"databases={databases_queried}, response_time_ms={response_time_ms:.2f}, cached={cached}"
+    _logger.info(
+        "URL lookup: url=%s, is_malicious=%s, databases=%s, response_time_ms=%.2f, cached=%s",
+        url,
+        is_malicious,
+        databases_queried,
+        response_time_ms,
+        cached,
     )
 
 
 def log_validation_error(url: str, error_detail: str) -> None:
     """Log a validation error with context."""
-    logger = get_logger(__name__)
-    logger.warning(f"URL validation failed: url={url}, error={error_detail}")
+    _logger.warning("URL validation failed: url=%s, error=%s", url, error_detail)
 
 
 def log_database_error(database_name: str, error_detail: str, response_time_ms: float) -> None:
     """Log a database query error with context."""
-    logger = get_logger(__name__)
-    logger.warning(
-        f"Database query failed: database={database_name}, "
-        f"error={error_detail}, response_time_ms={response_time_ms:.2f}"
+    _logger.warning(
+        "Database query failed: database=%s, error=%s, response_time_ms=%.2f",
+        database_name,
+        error_detail,
+        response_time_ms,
     )
@@ -6,54 +6,159 @@ dependencies so it can be used in unit tests and simple deployments.
 
 from __future__ import annotations
 
-import statistics
+import math
 import threading
+from typing import Any
 
-# Minimum number of samples required for accurate p95 percentile calculation
-_MIN_SAMPLES_FOR_P95 = 20
+# Log-scale histogram resolution: buckets per doubling of (value_ms + 1), ~9% wide
+_BUCKETS_PER_DOUBLING = 8
 
 _lock = threading.Lock()
-_counters: dict[str, int] = {}
-_timings: dict[str, list[float]] = {}
+_timings: dict[str, _Histogram] = {}
+# Gauges hold a level rather than a duration: (current value, highest value seen)
+_gauges: dict[str, tuple[float, float]] = {}
+
+# Counters are kept per thread so increments never contend on _lock; each
+# thread's buffer is registered once and summed when a snapshot is taken.
+# Buffers of finished threads are folded into _retired_counters, so counts are
+# kept while memory stays bounded by the number of live threads.
+_tls = threading.local()
+_counter_buffers: list[tuple[threading.Thread, dict[str, int]]] = []
+_retired_counters: dict[str, int] = {}
+
+
+class _Histogram:
+    """Constant-memory timing summary using log-scale buckets.
+
+    Recording is O(1) and percentiles are read from bucket counts, so memory and
+    snapshot cost depend on the value range rather than the number of samples.
+    """
+
+    __slots__ = ("buckets", "count", "max", "min", "total")
+
+    def __init__(self) -> None:
+        """Create an empty histogram."""
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value_ms: float) -> None:
+        """Add one sample."""
+        bucket = int(math.log2(max(value_ms, 0.0) + 1) * _BUCKETS_PER_DOUBLING)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def percentiles(self, *pcts: float) -> list[float]:
+        """Estimate the values below which each of `pcts` percent of samples fall.
+
+        All percentiles are read in one pass over the sorted buckets. Each is the
+        upper edge of the bucket holding its target rank, clamped to the observed
+        min/max.
+        """
+        ranks = [math.ceil(self.count * pct / 100) for pct in pcts]
+        results = [self.max] * len(pcts)
+        pending = sorted(range(len(pcts)), key=ranks.__getitem__)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            upper = 2 ** ((bucket + 1) / _BUCKETS_PER_DOUBLING) - 1
+            while pending and ranks[pending[0]] <= seen:
+                results[pending.pop(0)] = max(self.min, min(upper, self.max))
+            if not pending:
+                break
+        return results
+
+    def summary(self) -> dict[str, float]:
+        """Return count, min/max/mean and p50/p95/p99 in milliseconds."""
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            "count": self.count,
+            "min_ms": self.min,
+            "max_ms": self.max,
+            "mean_ms": self.total / self.count,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+        }
+
+
+def _thread_counters() -> dict[str, int]:
+    """Return the calling thread's counter buffer, registering it on first use."""
+    try:
+        counters: dict[str, int] = _tls.counters
+    except AttributeError:
+        buffer: dict[str, int] = {}
+        with _lock:
+            _fold_finished_threads()
+            _counter_buffers.append((threading.current_thread(), buffer))
+        _tls.counters = buffer
+        return buffer
+    return counters
+
+
+def _fold_finished_threads() -> None:
+    """Merge buffers of threads that have exited into _retired_counters.
+
+    Must be called with _lock held. A finished thread can no longer write to its
+    buffer, so it is read without copying.
+    """
+    live = []
+    for thread, buffer in _counter_buffers:
+        if thread.is_alive():
+            live.append((thread, buffer))
+            continue
+        for name, value in buffer.items():
+            _retired_counters[name] = _retired_counters.get(name, 0) + value
+    _counter_buffers[:] = live
 
 
 def incr(metric: str, amount: int = 1) -> None:
     """Increment a named counter by `amount`."""
-    with _lock:
-        _counters[metric] = _counters.get(metric, 0) + int(amount)
+    counters = _thread_counters()
+    counters[metric] = counters.get(metric, 0) + int(amount)
 
 
 def timing(metric: str, value_ms: float) -> None:
     """Record a timing value (milliseconds) for a named metric."""
     with _lock:
-        _timings.setdefault(metric, []).append(float(value_ms))
+        histogram = _timings.get(metric)
+        if histogram is None:
+            histogram = _timings[metric] = _Histogram()
+        histogram.record(float(value_ms))
 
 
-def get_metrics() -> dict:
-    """Return a snapshot of current metrics (counters and timing summaries)."""
+def gauge(metric: str, value: float) -> None:
+    """Set a named gauge to `value`, keeping the highest value it has reached."""
     with _lock:
-        counters = dict(_counters)
-        timings = {k: list(v) for k, v in _timings.items()}
+        peak = _gauges[metric][1] if metric in _gauges else value
+        _gauges[metric] = (value, max(peak, value))
 
-    timing_stats = {}
-    for name, values in timings.items():
-        if not values:
-            continue
-        timing_stats[name] = {
-            "count": len(values),
-            "min_ms": min(values),
-            "max_ms": max(values),
-            "mean_ms": statistics.mean(values),
-            "p95_ms": statistics.quantiles(values, n=100)[94]
-            if len(values) >= _MIN_SAMPLES_FOR_P95
-            else max(values),
-        }
 
-    return {"counters": counters, "timings": timing_stats}
+def get_metrics() -> dict[str, Any]:
+    """Return a snapshot of current metrics (counters, timing summaries, gauges)."""
+    with _lock:
+        _fold_finished_threads()
+        counters = dict(_retired_counters)
+        # dict.copy() is atomic, so owning threads may keep incrementing meanwhile
+        for _, buffer in _counter_buffers:
+            for name, value in buffer.copy().items():
+                counters[name] = counters.get(name, 0) + value
+        timing_stats = {name: hist.summary() for name, hist in _timings.items() if hist.count}
+        gauges = {name: {"value": value, "max": peak} for name, (value, peak) in _gauges.items()}
+
+    return {"counters": counters, "timings": timing_stats, "gauges": gauges}
 
 
 def reset_metrics() -> None:
     """Reset all metrics (useful for tests)."""
     with _lock:
-        _counters.clear()
+        for _, buffer in _counter_buffers:
+            buffer.clear()
+        _retired_counters.clear()
         _timings.clear()
+        _gauges.clear()
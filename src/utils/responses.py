@@ -0,0 +1,14 @@
+"""Fast JSON response class for API endpoints."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson instead of the stdlib json module."""
+
+    def render(self, content: Any) -> bytes:
+        """Serialize response content to JSON bytes."""
+        return orjson.dumps(content)
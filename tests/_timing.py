@@ -0,0 +1,61 @@
+"""Timing helpers shared by the performance tests."""
+
+import re
+import time
+from statistics import NormalDist
+
+import httpx
+
+_SERVER_TIMING_RE = re.compile(r"(\w+);dur=([\d.]+)")
+
+
+def ms_since(start_ns: int) -> float:
+    """Return milliseconds elapsed since a time.perf_counter_ns() reading.
+
+    perf_counter_ns is monotonic with nanosecond resolution, unlike time.time(),
+    so short intervals are neither rounded to the wall-clock tick nor skewed by
+    clock adjustments.
+    """
+    return (time.perf_counter_ns() - start_ns) / 1_000_000
+
+
+def parse_server_timing(response: httpx.Response) -> dict[str, float]:
+    """Return the Server-Timing durations (milliseconds) reported by the service.
+
+    These measure work done inside the app, without the test client's transport
+    and JSON overhead.
+    """
+    header = response.headers.get("server-timing", "")
+    return {name: float(dur) for name, dur in _SERVER_TIMING_RE.findall(header)}
+
+
+def mann_whitney_greater(x: list[float], y: list[float]) -> float:
+    """Return the one-sided Mann-Whitney U p-value that `x` tends to exceed `y`.
+
+    Uses the normal approximation with tie correction, which is accurate for the
+    tens of samples the benchmarks collect, so scipy is not needed.
+    """
+    n_x, n_y = len(x), len(y)
+    pooled = sorted([(value, 0) for value in x] + [(value, 1) for value in y])
+
+    # Average ranks over ties; accumulate the rank sum of x and the tie correction
+    rank_sum_x = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j < len(pooled) and pooled[j][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j + 1) / 2
+        rank_sum_x += rank * sum(1 for _, group in pooled[i:j] if group == 0)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+
+    n = n_x + n_y
+    u = rank_sum_x - n_x * (n_x + 1) / 2
+    sigma = (n_x * n_y / 12 * ((n + 1) - tie_term / (n * (n - 1)))) ** 0.5
+    if sigma == 0:
+        return 1.0
+    # Continuity correction of 0.5 toward the mean
+    z = (u - n_x * n_y / 2 - 0.5) / sigma
+    return 1 - NormalDist().cdf(z)
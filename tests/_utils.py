@@ -0,0 +1,15 @@
+"""Response helpers shared by the API tests."""
+
+from typing import Any
+
+import httpx
+import orjson
+
+
+def response_json(response: httpx.Response) -> Any:
+    """Decode a response body with orjson, straight from bytes.
+
+    The service itself serializes with orjson, and this skips the str decode
+    and stdlib json parse done by response.json().
+    """
+    return orjson.loads(response.content)
@@ -1,80 +1,79 @@
 """Test fixtures and configuration for pytest."""
 
 import asyncio
-import importlib
 from pathlib import Path
 
+import httpx
 import pytest
 from aiohttp import web
 from fastapi.testclient import TestClient
 
-import src.main
-from src.api import urlinfo as urlinfo_module
 from src.main import app as test_app
 from src.main import create_malware_checker as create_checker
 from src.utils.cache import url_cache
 
-
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an event loop for the test session."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-
-    yield loop
-    loop.close()
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 
-@pytest.fixture
-def async_client():
-    """Create a test client with initialized malware checker."""
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop where it is installed, as the server does."""
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
 
-    # Reload main module to get fresh app and checker
-    importlib.reload(src.main)
 
-    # Initialize malware checker for testing
+@pytest.fixture(scope="session")
+def checker():
+    """Create and initialize one malware checker for the whole session."""
     test_checker = create_checker()
 
-    # Initialize loaders synchronously in test
+    # Loaders start once on a private loop; TestClient serves the app on its own
     loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
     loop.run_until_complete(test_checker.initialize())
-    urlinfo_module.set_malware_checker(test_checker)
+    yield test_checker
 
-    # Create and return test client
-    client = TestClient(test_app)
-    yield client
-
-    # Cleanup
     loop.run_until_complete(test_checker.shutdown())
     loop.close()
 
 
+@pytest.fixture(scope="session")
+def session_client() -> TestClient:
+    """Create one reusable test client for the session."""
+    return TestClient(test_app)
+
+
 @pytest.fixture
-def client():
-    """Alias for async_client for integration tests."""
+def async_client(checker, session_client):
+    """Return the test client wired to a checker with fresh statistics."""
+    checker.reset_statistics()
+    test_app.state.malware_checker = checker
+    return session_client
 
-    # Reload main module to get fresh app and checker
-    importlib.reload(src.main)
 
-    # Initialize malware checker for testing
-    test_checker = create_checker()
+@pytest.fixture(scope="session")
+async def asgi_session_client():
+    """Create one async client serving the app in-process for the session."""
+    transport = httpx.ASGITransport(app=test_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
 
-    # Initialize loaders synchronously in test
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(test_checker.initialize())
-    urlinfo_module.set_malware_checker(test_checker)
 
-    # Create and return test client
-    test_client = TestClient(test_app)
-    yield test_client
+@pytest.fixture
+def asgi_client(checker, asgi_session_client):
+    """Return the async client, for truly concurrent requests, wired to the checker."""
+    checker.reset_statistics()
+    test_app.state.malware_checker = checker
+    return asgi_session_client
+
 
-    # Cleanup
-    loop.run_until_complete(test_checker.shutdown())
-    loop.close()
+@pytest.fixture
+def client(async_client):
+    """Alias for async_client for integration tests."""
+    return async_client
 
 
 @pytest.fixture(autouse=True)
@@ -7,26 +7,30 @@ Tests verify that the API meets performance SLAs:
 - Database query performance under load
 """
 
+import asyncio
 import time
 
+from tests._timing import ms_since, parse_server_timing
+from tests._utils import response_json
+
 
 class TestResponseTimeContract:
     """T055: Response time performance SLA."""
 
     def test_single_request_under_1000ms(self, async_client):
         """Single request should complete within 1000ms."""
-        start = time.time()
+        start = time.perf_counter_ns()
         response = async_client.get("/urlinfo/1/google.com/")
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = ms_since(start)
 
         assert response.status_code == 200
         assert elapsed_ms < 1000, f"Request took {elapsed_ms:.1f}ms, expected < 1000ms"
 
     def test_invalid_url_validation_under_100ms(self, async_client):
         """Invalid URL validation should fail fast (< 100ms)."""
-        start = time.time()
+        start = time.perf_counter_ns()
         response = async_client.get("/urlinfo/1//")
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = ms_since(start)
 
         assert response.status_code == 400
         assert elapsed_ms < 100, f"Validation took {elapsed_ms:.1f}ms, expected < 100ms"
@@ -36,31 +40,24 @@ class TestResponseTimeContract:
         # First request - not cached
         async_client.get("/urlinfo/1/example.com/")
 
-        # Second request - should be cached
-        start = time.time()
+        # Second request - should be cached; judged on server-side time only
         response = async_client.get("/urlinfo/1/example.com/")
-        elapsed_ms = (time.time() - start) * 1000
+        server_timing = parse_server_timing(response)
 
         assert response.status_code == 200
-        # Cached responses should be much faster (but allow some margin)
-        assert elapsed_ms < 100  # Reasonable cached response time
+        assert server_timing["cache"] < 10, f"Cache hit took {server_timing['cache']:.3f}ms"
 
 
 class TestConcurrentRequestHandling:
     """T056: Handle concurrent requests without blocking."""
 
-    def test_10_concurrent_requests_succeed(self, async_client):
-        """10 concurrent-like requests should all succeed."""
+    async def test_10_concurrent_requests_succeed(self, asgi_client):
+        """10 concurrent requests should all succeed."""
         urls = [f"/urlinfo/1/test-{i}.com/" for i in range(10)]
 
-        responses = []
-        start = time.time()
-
-        # Simulate concurrent requests (sequential in test, but measures time)
-        for url in urls:
-            responses.append(async_client.get(url))
-
-        elapsed_ms = (time.time() - start) * 1000
+        start = time.perf_counter_ns()
+        responses = await asyncio.gather(*(asgi_client.get(url) for url in urls))
+        elapsed_ms = ms_since(start)
 
         # All requests should succeed
         assert all(r.status_code == 200 for r in responses)
@@ -68,7 +65,7 @@ class TestConcurrentRequestHandling:
         # Total time should be reasonable (not sum of individual times)
         assert elapsed_ms < 5000, f"10 requests took {elapsed_ms:.0f}ms"
 
-    def test_mixed_valid_invalid_requests_concurrent(self, async_client):
+    async def test_mixed_valid_invalid_requests_concurrent(self, asgi_client):
         """Mix of valid and invalid requests should all complete."""
         urls = [
             "/urlinfo/1/google.com/",
@@ -78,9 +75,7 @@ class TestConcurrentRequestHandling:
             "/urlinfo/1/github.com/",
         ]
 
-        responses = []
-        for url in urls:
-            responses.append(async_client.get(url))
+        responses = await asyncio.gather(*(asgi_client.get(url) for url in urls))
 
         # Should have appropriate status codes
         assert responses[0].status_code == 200  # valid
@@ -109,15 +104,12 @@ class TestCachePerformance:
         """Cached request should be generally fast."""
         url = "/urlinfo/1/cached-test.com/"
 
-        # First request - uncached, measure time
-        start1 = time.time()
+        # First request - uncached, second - cached; compare server-side time
         response1 = async_client.get(url)
-        time1_ms = (time.time() - start1) * 1000
+        time1_ms = parse_server_timing(response1)["db"]
 
-        # Second request - cached, measure time
-        start2 = time.time()
         response2 = async_client.get(url)
-        time2_ms = (time.time() - start2) * 1000
+        time2_ms = parse_server_timing(response2)["cache"]
 
         assert response1.status_code == 200
         assert response2.status_code == 200
@@ -133,11 +125,11 @@ class TestCachePerformance:
 
         # First request
         r1 = async_client.get(url)
-        data1 = r1.json()
+        data1 = response_json(r1)
 
         # Second request - should be cached
         r2 = async_client.get(url)
-        data2 = r2.json()
+        data2 = response_json(r2)
 
         # Both should have cached flag
         assert "cached" in data1
@@ -148,7 +140,7 @@ class TestCachePerformance:
     def test_response_time_included(self, async_client):
         """Response should include timing information."""
         response = async_client.get("/urlinfo/1/timing-test.com/")
-        data = response.json()
+        data = response_json(response)
 
         assert "response_time_ms" in data
         assert data["response_time_ms"] > 0
@@ -160,34 +152,34 @@ class TestDatabaseQueryPerformance:
 
     def test_malware_lookup_fast_miss(self, async_client):
         """Negative (not malicious) lookup should be fast."""
-        start = time.time()
+        start = time.perf_counter_ns()
         response = async_client.get("/urlinfo/1/safe-clean.com/")
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = ms_since(start)
 
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert data["is_malicious"] is False
         assert elapsed_ms < 500
 
     def test_malware_lookup_fast_hit(self, async_client):
         """Positive (malicious) lookup should be fast."""
-        start = time.time()
+        start = time.perf_counter_ns()
         response = async_client.get("/urlinfo/1/evil.net/")
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = ms_since(start)
 
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert data["is_malicious"] is True
         assert elapsed_ms < 500
 
-    def test_parallel_database_queries(self, async_client):
+    async def test_parallel_database_queries(self, asgi_client):
         """Multiple parallel database queries should complete efficiently."""
         # This tests that asyncio.gather() is working efficiently
         urls = [f"/urlinfo/1/multi-{i}.com/" for i in range(5)]
 
-        start = time.time()
-        responses = [async_client.get(url) for url in urls]
-        elapsed_ms = (time.time() - start) * 1000
+        start = time.perf_counter_ns()
+        responses = await asyncio.gather(*(asgi_client.get(url) for url in urls))
+        elapsed_ms = ms_since(start)
 
         # All should complete
         assert all(r.status_code == 200 for r in responses)
@@ -200,13 +192,14 @@ class TestLoadStability:
 
     def test_100_sequential_requests_succeed(self, async_client):
         """100 sequential requests should all succeed without error."""
-        start = time.time()
+        urls = tuple(map("/urlinfo/1/load-test-{}.com/".format, (i % 10 for i in range(100))))
+        start = time.perf_counter_ns()
 
-        for i in range(100):
-            response = async_client.get(f"/urlinfo/1/load-test-{i % 10}.com/")
+        for url in urls:
+            response = async_client.get(url)
             assert response.status_code in [200, 400]  # All should be valid responses
 
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = ms_since(start)
 
         # Should complete in reasonable time
         avg_time = elapsed_ms / 100
@@ -218,9 +211,8 @@ class TestLoadStability:
 
         times = []
         for _i in range(5):
-            start = time.time()
             response = async_client.get(url)
-            times.append((time.time() - start) * 1000)
+            times.append(parse_server_timing(response)["total"])
             assert response.status_code == 200
 
         # Later requests should be faster (cached)
@@ -231,17 +223,19 @@ class TestLoadStability:
         valid_times = []
         invalid_times = []
 
+        valid_urls = [f"/urlinfo/1/perf-{i}.com/" for i in range(10)]
+
         # Mix of valid and invalid requests
-        for i in range(10):
+        for url in valid_urls:
             # Valid request
-            start = time.time()
-            async_client.get(f"/urlinfo/1/perf-{i}.com/")
-            valid_times.append((time.time() - start) * 1000)
+            start = time.perf_counter_ns()
+            async_client.get(url)
+            valid_times.append(ms_since(start))
 
             # Invalid request
-            start = time.time()
+            start = time.perf_counter_ns()
             async_client.get("/urlinfo/1/")
-            invalid_times.append((time.time() - start) * 1000)
+            invalid_times.append(ms_since(start))
 
         # Both should average < 50ms
         avg_valid = sum(valid_times) / len(valid_times)
@@ -3,13 +3,16 @@
 Tests verify the API contract: request/response format, status codes, and required fields.
 """
 
+from tests._timing import parse_server_timing
+from tests._utils import response_json
+
 
 def test_valid_url_returns_200(async_client):
     """T017: Valid URL returns 200 with all required response fields."""
     response = async_client.get("/urlinfo/1/example.com:80/")
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
 
     # Verify all required fields present
     assert "url" in data
@@ -26,6 +29,7 @@ def test_valid_url_returns_200(async_client):
     assert isinstance(data["threat_level"], str)
     assert isinstance(data["cached"], bool)
     assert isinstance(data["timestamp"], str)
+    assert data["timestamp"].endswith("Z")
     assert isinstance(data["databases_queried"], list)
     assert isinstance(data["response_time_ms"], (int, float))
 
@@ -36,7 +40,7 @@ def test_malware_url_detected(async_client):
     response = async_client.get("/urlinfo/1/example.com:80/")
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
 
     # example.com is in the malware list
     assert data["is_malicious"] is True
@@ -49,7 +53,7 @@ def test_safe_url_not_detected(async_client):
     response = async_client.get("/urlinfo/1/google.com:80/")
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
 
     # google.com is not in the malware list
     assert data["is_malicious"] is False
@@ -76,8 +80,26 @@ def test_health_check_endpoint(async_client):
     response = async_client.get("/health")
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
 
     # Should have basic status info
     assert "status" in data or "ready" in data
     assert "loaders" in data or "service" in data or "url" in data
+
+
+def test_request_id_and_timing_headers(async_client):
+    """Incoming X-Request-ID is echoed back and X-Response-Time is reported."""
+    response = async_client.get("/urlinfo/1/", headers={"X-Request-ID": "req-contract"})
+
+    assert response.status_code == 400
+    assert response.headers.get_list("x-request-id") == ["req-contract"]
+    assert float(response.headers["x-response-time"]) >= 0
+
+
+def test_server_timing_header(async_client):
+    """Lookups report server-side check and total durations in Server-Timing."""
+    miss = async_client.get("/urlinfo/1/server-timing.com/")
+    hit = async_client.get("/urlinfo/1/server-timing.com/")
+
+    assert set(parse_server_timing(miss)) == {"db", "total"}
+    assert set(parse_server_timing(hit)) == {"cache", "total"}
@@ -3,6 +3,8 @@
 Tests verify API contract for error handling: status codes, error format, and messages.
 """
 
+from tests._utils import response_json
+
 
 def test_empty_url_rejection(async_client):
     """T032: Empty URL returns 400 with error detail."""
@@ -10,7 +12,7 @@ def test_empty_url_rejection(async_client):
 
     # Should return 400 or 422 (validation error)
     assert response.status_code in (400, 422)
-    data = response.json()
+    data = response_json(response)
 
     # Should include error detail
     assert "detail" in data or "error" in data
@@ -48,7 +50,7 @@ def test_error_response_format(async_client):
     response = async_client.get("/urlinfo/1//")
 
     if response.status_code in (400, 422):
-        data = response.json()
+        data = response_json(response)
 
         # Should have detail or error message
         assert "detail" in data or "error" in data
@@ -74,3 +76,10 @@ def test_health_check_available_on_validation_error(async_client):
     # Health check should still work
     response = async_client.get("/health")
     assert response.status_code == 200
+
+
+def test_out_of_range_port_rejection(async_client):
+    """T036c: Port numbers outside 0-65535 return 400."""
+    response = async_client.get("/urlinfo/1/example.com:70000/")
+
+    assert response.status_code == 400
@@ -5,6 +5,9 @@ Tests verify end-to-end functionality: URL validation → database queries → r
 
 import time
 
+from tests._timing import ms_since
+from tests._utils import response_json
+
 
 def test_end_to_end_malware_detection_workflow(async_client):
     """T021: Complete workflow - URL submitted, validated, checked, response returned."""
@@ -12,7 +15,7 @@ def test_end_to_end_malware_detection_workflow(async_client):
     response = async_client.get("/urlinfo/1/evil.net/trojan")
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
 
     # Verify complete workflow results
     assert "evil.net" in data["url"].lower()
@@ -25,25 +28,26 @@ def test_end_to_end_malware_detection_workflow(async_client):
 def test_concurrent_request_handling(async_client):
     """T022: Handle multiple requests quickly without blocking."""
     # Submit multiple requests sequentially (TestClient doesn't support true concurrency)
+    urls = tuple(map("/urlinfo/1/example{}.com:80/".format, range(10)))  # Use 10 with TestClient
     responses = []
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
 
-    for i in range(10):  # Use 10 with TestClient
-        response = async_client.get(f"/urlinfo/1/example{i}.com:80/")
+    for url in urls:
+        response = async_client.get(url)
         responses.append(response)
 
-    elapsed = time.time() - start_time
+    elapsed_ms = ms_since(start_time)
 
     # All requests should complete successfully
     assert len(responses) == 10
     for response in responses:
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert "url" in data
         assert "is_malicious" in data
 
     # Should complete reasonably quickly
-    assert elapsed < 30, f"Requests took {elapsed:.2f}s"
+    assert elapsed_ms < 30_000, f"Requests took {elapsed_ms:.0f}ms"
 
 
 def test_cache_hit_behavior(async_client):
@@ -53,14 +57,14 @@ def test_cache_hit_behavior(async_client):
     # First request (cache miss)
     first_response = async_client.get(url_path)
     assert first_response.status_code == 200
-    first_data = first_response.json()
+    first_data = response_json(first_response)
     first_cached = first_data["cached"]
     first_latency = first_data["response_time_ms"]
 
     # Second request (cache hit)
     second_response = async_client.get(url_path)
     assert second_response.status_code == 200
-    second_data = second_response.json()
+    second_data = response_json(second_response)
     second_cached = second_data["cached"]
     second_latency = second_data["response_time_ms"]
 
@@ -76,7 +80,7 @@ def test_multiple_databases_queried(async_client):
     response = async_client.get("/urlinfo/1/example.com:80/")
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
 
     # Should have queried at least one database
     assert len(data["databases_queried"]) >= 1
@@ -92,7 +96,7 @@ def test_response_time_tracking(async_client):
     response = async_client.get("/urlinfo/1/example.com:80/")
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
 
     # Response time should be positive and reasonable
     assert data["response_time_ms"] > 0
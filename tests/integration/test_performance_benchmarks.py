@@ -3,95 +3,103 @@
 Tests that establish baseline performance metrics and detect regressions.
 """
 
+import asyncio
+import logging
 import time
-from statistics import mean
+import tracemalloc
+from pathlib import Path
+from statistics import mean, quantiles
 
 import pytest
 
+import src
+from tests._timing import mann_whitney_greater, ms_since, parse_server_timing
+from tests._utils import response_json
+
+WARMUP_REQUESTS = 3
+CACHE_SAMPLES = 50
+SERVICE_ROOT = Path(src.__file__).parent
+
+
+def _warm_up(client) -> None:
+    """Send untimed requests so one-time setup costs stay out of the measurements."""
+    for _ in range(WARMUP_REQUESTS):
+        client.get("/urlinfo/1/warmup.com/")
+
 
 class TestPerformanceBenchmarks:
     """T060: Establish performance baselines."""
 
-    def test_single_request_baseline(self, async_client):
-        """Establish baseline for single request performance."""
+    @pytest.mark.parametrize(
+        ("url_template", "max_avg_ms", "status"),
+        [
+            # Distinct hosts so every request misses the cache
+            ("/urlinfo/1/bench-{}.com/", 100, 200),
+            ("/urlinfo/1/evil.net/", 500, 200),
+            ("/urlinfo/1/", 50, 400),
+        ],
+        ids=["single_request", "malware_detection", "validation_error"],
+    )
+    def test_baseline(self, async_client, record_property, url_template, max_avg_ms, status):
+        """Average latency for each request kind stays within its baseline."""
+        urls = tuple(map(url_template.format, range(10)))
+        _warm_up(async_client)
         times = []
 
-        for i in range(10):
-            start = time.time()
-            response = async_client.get(f"/urlinfo/1/bench-{i}.com/")
-            elapsed_ms = (time.time() - start) * 1000
+        for url in urls:
+            start = time.perf_counter_ns()
+            response = async_client.get(url)
+            elapsed_ms = ms_since(start)
             times.append(elapsed_ms)
-            assert response.status_code == 200
+            assert response.status_code == status
 
         avg_time = mean(times)
-
-        # Performance baseline: average should be < 100ms
-        assert avg_time < 100, f"Average response time: {avg_time:.1f}ms"
-
         # Log metrics for trend analysis
-        pytest.skip(f"Baseline: {avg_time:.1f}ms (min: {min(times):.1f}, max: {max(times):.1f})")
-
-    def test_malware_detection_baseline(self, async_client):
-        """Baseline for malware detection performance."""
-        times = []
+        record_property("avg_ms", round(avg_time, 3))
+        record_property("min_ms", round(min(times), 3))
+        record_property("max_ms", round(max(times), 3))
 
-        for _i in range(10):
-            start = time.time()
-            response = async_client.get("/urlinfo/1/evil.net/")
-            elapsed_ms = (time.time() - start) * 1000
-            times.append(elapsed_ms)
-            assert response.status_code == 200
+        assert avg_time < max_avg_ms, f"Average response time: {avg_time:.1f}ms"
 
-        avg_time = mean(times)
-        assert avg_time < 500, f"Malware check average: {avg_time:.1f}ms"
 
-    def test_validation_error_baseline(self, async_client):
-        """Baseline for validation error performance."""
-        times = []
+async def _get_all(client, urls: list[str], limit: int = 64) -> list:
+    """Issue GETs for all urls concurrently, with at most `limit` in flight."""
+    semaphore = asyncio.Semaphore(limit)
 
-        for _i in range(10):
-            start = time.time()
-            response = async_client.get("/urlinfo/1/")
-            elapsed_ms = (time.time() - start) * 1000
-            times.append(elapsed_ms)
-            assert response.status_code == 400
+    async def get(url: str):
+        async with semaphore:
+            return await client.get(url)
 
-        avg_time = mean(times)
-        # Validation errors should be fast
-        assert avg_time < 50, f"Validation error average: {avg_time:.1f}ms"
+    return await asyncio.gather(*(get(url) for url in urls))
 
 
 class TestThroughputPerformance:
     """Test maximum throughput characteristics."""
 
-    def test_requests_per_second_minimum(self, async_client):
+    @pytest.mark.parametrize("n", [100, 1000])
+    async def test_requests_per_second_minimum(self, asgi_client, n):
         """System should handle minimum 10 req/sec."""
-        start = time.time()
-        request_count = 0
+        urls = [f"/urlinfo/1/rps-test-{i}.com/" for i in range(n)]
 
-        while time.time() - start < 1.0:  # Run for 1 second
-            response = async_client.get(f"/urlinfo/1/rps-test-{request_count}.com/")
-            if response.status_code == 200:
-                request_count += 1
+        start = time.perf_counter_ns()
+        responses = await _get_all(asgi_client, urls)
+        rps = n / (ms_since(start) / 1000)
 
+        assert all(r.status_code == 200 for r in responses)
         # Should handle at least 10 requests per second
-        assert request_count >= 10, f"Only {request_count} req/sec"
+        assert rps >= 10, f"Only {rps:.0f} req/sec"
 
-    def test_sustained_throughput(self, async_client):
+    async def test_sustained_throughput(self, asgi_client):
         """Throughput should be consistent over time."""
         segments = []
 
-        # Run 5 x 1-second segments
-        for _segment in range(5):
-            start = time.time()
-            count = 0
-
-            while time.time() - start < 1.0:
-                response = async_client.get(f"/urlinfo/1/sustained-{count}.com/")
-                if response.status_code == 200:
-                    count += 1
-
-            segments.append(count)
+        # Run 5 back-to-back batches
+        for segment in range(5):
+            urls = [f"/urlinfo/1/sustained-{segment}-{i}.com/" for i in range(200)]
+            start = time.perf_counter_ns()
+            responses = await _get_all(asgi_client, urls)
+            segments.append(len(urls) / (ms_since(start) / 1000))
+            assert all(r.status_code == 200 for r in responses)
 
         # All segments should be similar (no degradation)
         avg_segment = mean(segments)
@@ -101,48 +109,43 @@ class TestThroughputPerformance:
 class TestLatencyDistribution:
     """Test response time distribution and outliers."""
 
-    def test_p99_latency(self):
-        """99th percentile latency should be reasonable."""
-        times = []
-
-        for _i in range(100):
-            start = time.time()
-            elapsed_ms = (time.time() - start) * 1000
-            times.append(elapsed_ms)
-
-        times_sorted = sorted(times)
-        p99_idx = int(len(times_sorted) * 0.99)
-        p99_latency = times_sorted[p99_idx]
-
-        # P99 should be under 500ms
-        assert p99_latency < 500, f"P99 latency: {p99_latency:.1f}ms"
-
-    def test_p95_latency(self):
-        """95th percentile latency should be very good."""
-        times = []
-
-        for _i in range(100):
-            start = time.time()
-            elapsed_ms = (time.time() - start) * 1000
-            times.append(elapsed_ms)
-
-        times_sorted = sorted(times)
-        p95_idx = int(len(times_sorted) * 0.95)
-        p95_latency = times_sorted[p95_idx]
+    SAMPLES = 500
 
-        # P95 should be under 200ms
-        assert p95_latency < 200, f"P95 latency: {p95_latency:.1f}ms"
-
-    def test_outlier_requests_reasonable(self):
+    def _measure(self, client, prefix: str) -> list[float]:
+        """Issue SAMPLES distinct lookups and return their latencies in milliseconds."""
+        times = [0.0] * self.SAMPLES
+        urls = [f"/urlinfo/1/{prefix}-{i}.com/" for i in range(self.SAMPLES)]
+        for i, url in enumerate(urls):
+            start = time.perf_counter_ns()
+            response = client.get(url)
+            times[i] = ms_since(start)
+            assert response.status_code == 200
+        return times
+
+    def _percentiles(self, times: list[float], record_property) -> dict[int, float]:
+        """Compute p50/p95/p99 in one pass and record them for trend analysis."""
+        cuts = quantiles(times, n=100, method="inclusive")
+        result = {pct: cuts[pct - 1] for pct in (50, 95, 99)}
+        for pct, value in result.items():
+            record_property(f"p{pct}_ms", round(value, 3))
+        return result
+
+    @pytest.mark.parametrize(("percentile", "max_ms"), [(99, 500), (95, 200)])
+    def test_percentile_latency(self, async_client, record_property, percentile, max_ms):
+        """High-percentile latency stays within budget (P99 < 500ms, P95 < 200ms)."""
+        measured = self._percentiles(
+            self._measure(async_client, f"p{percentile}"), record_property
+        )[percentile]
+
+        assert measured < max_ms, f"P{percentile} latency: {measured:.1f}ms"
+
+    def test_outlier_requests_reasonable(self, async_client, record_property):
         """Even slowest requests should be reasonable."""
-        times = []
-
-        for _i in range(50):
-            start = time.time()
-            elapsed_ms = (time.time() - start) * 1000
-            times.append(elapsed_ms)
+        times = self._measure(async_client, "outlier")
+        self._percentiles(times, record_property)
 
         max_time = max(times)
+        record_property("max_ms", round(max_time, 3))
         # Even worst case should be under 1 second
         assert max_time < 1000, f"Worst case: {max_time:.1f}ms"
 
@@ -150,12 +153,35 @@ class TestLatencyDistribution:
 class TestResourceUtilization:
     """Test resource efficiency."""
 
-    def test_memory_not_growing_unbounded(self, async_client):
+    async def test_memory_not_growing_unbounded(self, asgi_client, caplog):
         """Memory should not grow unbounded with requests."""
-        # Just verify we can make many requests without error
-        for i in range(200):
-            response = async_client.get(f"/urlinfo/1/mem-{i % 20}.com/")
-            assert response.status_code == 200
+        # Log records retained by pytest's capture would otherwise count as growth
+        caplog.set_level(logging.WARNING)
+        urls = [f"/urlinfo/1/leak-{i % 50}.com/" for i in range(1000)]
+
+        tracemalloc.start(25)
+        try:
+            # Fill the cache and lazily built state before the baseline snapshot
+            for url in urls[:50]:
+                await asgi_client.get(url)
+            # In-process requests never yield to the loop, so let it release the
+            # timeout timers of finished requests before each snapshot
+            await asyncio.sleep(0.01)
+            before = tracemalloc.take_snapshot()
+
+            for url in urls:
+                response = await asgi_client.get(url)
+                assert response.status_code == 200
+            await asyncio.sleep(0.01)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        # Count only allocations made with service code on the stack
+        service_only = [tracemalloc.Filter(True, str(SERVICE_ROOT / "*"), all_frames=True)]
+        after, before = after.filter_traces(service_only), before.filter_traces(service_only)
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        assert growth < 1_000_000, f"Memory grew by {growth / 1024:.0f} KiB over 1000 requests"
 
     def test_no_connection_leaks(self, async_client):
         """Repeated requests should not leak connections."""
@@ -172,38 +198,35 @@ class TestResourceUtilization:
 class TestCacheAssistedPerformance:
     """T061: Cache-assisted performance improvements."""
 
-    def test_cache_reduces_response_time(self, async_client):
+    async def test_cache_reduces_response_time(self, asgi_client):
         """Cache should significantly reduce response time."""
         url = "/urlinfo/1/cache-perf.com/"
+        uncached_urls = [f"/urlinfo/1/uncached-{i}.com/" for i in range(CACHE_SAMPLES)]
+        await asgi_client.get("/urlinfo/1/warmup.com/")
 
-        # First request (uncached)
-        times_uncached = []
-        for _ in range(3):
-            # Clear cache effect by using different URLs
-            start = time.time()
-            async_client.get(f"/urlinfo/1/uncached-{_}.com/")
-            times_uncached.append((time.time() - start) * 1000)
+        # Distinct URLs all miss the cache; requests run concurrently
+        uncached = await asyncio.gather(*(asgi_client.get(u) for u in uncached_urls))
 
-        # Repeated request (cached)
-        times_cached = []
-        for _ in range(10):
-            start = time.time()
-            async_client.get(url)
-            times_cached.append((time.time() - start) * 1000)
+        # Prime the cache, then every request for the same URL is a hit
+        await asgi_client.get(url)
+        cached = await asyncio.gather(*(asgi_client.get(url) for _ in range(CACHE_SAMPLES)))
 
-        avg_uncached = mean(times_uncached)
-        avg_cached = mean(times_cached)
+        # Compare server-side check times, which exclude transport overhead
+        times_uncached = [parse_server_timing(r)["db"] for r in uncached]
+        times_cached = [parse_server_timing(r)["cache"] for r in cached]
+        p_value = mann_whitney_greater(times_uncached, times_cached)
 
         # Cached should be noticeably faster
-        assert avg_cached < avg_uncached * 0.9, (
-            f"Uncached: {avg_uncached:.1f}ms, Cached: {avg_cached:.1f}ms"
+        assert p_value < 0.01, (
+            f"Uncached: {mean(times_uncached):.3f}ms, Cached: {mean(times_cached):.3f}ms, "
+            f"p={p_value:.3g}"
         )
 
     def test_cache_enabled_configuration(self, async_client):
         """Cache should be enabled by default."""
         # Make a request and check if cached flag appears
         response = async_client.get("/urlinfo/1/cache-config.com/")
-        data = response.json()
+        data = response_json(response)
 
         # Response should have cached field
         assert "cached" in data
@@ -4,6 +4,10 @@ Tests verify that invalid URLs are rejected before database queries,
 and that request_id is preserved throughout the workflow.
 """
 
+import asyncio
+
+from tests._utils import response_json
+
 
 class TestValidationWorkflow:
     """T046: Test validation integration in URL lookup workflow."""
@@ -35,14 +39,14 @@ class TestValidationWorkflow:
         # "evil.net" is in our malware list
         response = client.get("/urlinfo/1/evil.net/")
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert data["is_malicious"] is True
 
     def test_safe_url_returns_success(self, client):
         """Safe URL returns 200 with is_malicious=false."""
         response = client.get("/urlinfo/1/google.com/")
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert "is_malicious" in data
         assert data["is_malicious"] is False
 
@@ -50,14 +54,14 @@ class TestValidationWorkflow:
         """Valid URLs are checked against databases."""
         response = client.get("/urlinfo/1/github.com/path")
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert "databases_queried" in data
         assert len(data["databases_queried"]) > 0
 
-    def test_concurrent_valid_requests_all_succeed(self, client):
+    async def test_concurrent_valid_requests_all_succeed(self, asgi_client):
         """Multiple valid concurrent requests all succeed."""
         urls = ["/urlinfo/1/example.com/", "/urlinfo/1/test.org/", "/urlinfo/1/demo.net/"]
-        responses = [client.get(url) for url in urls]
+        responses = await asyncio.gather(*(asgi_client.get(url) for url in urls))
         # All should complete successfully
         for resp in responses:
             assert resp.status_code == 200
@@ -75,12 +79,12 @@ class TestValidationWorkflow:
         # First request
         response1 = client.get("/urlinfo/1/safe.org/")
         assert response1.status_code == 200
-        data1 = response1.json()
+        data1 = response_json(response1)
 
         # Second request - same URL might be served from cache
         response2 = client.get("/urlinfo/1/safe.org/")
         assert response2.status_code == 200
-        data2 = response2.json()
+        data2 = response_json(response2)
 
         # Both should have valid responses
         assert data1["is_malicious"] in [True, False]
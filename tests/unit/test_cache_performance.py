@@ -5,11 +5,15 @@ Tests verify cache implementation efficiency:
 - TTL enforcement
 - Memory efficiency
 - Cache eviction policies
+- Coalescing of concurrent misses
 """
 
+import asyncio
+import logging
 import time
 
-from src.utils.cache import URLCache
+from src.utils.cache import ShardedTTLCache, URLCache
+from tests._timing import ms_since
 
 
 class TestCachePerformance:
@@ -23,22 +27,22 @@ class TestCachePerformance:
         cache.set("test_key", {"malicious": False})
 
         # Lookup should be very fast
-        start = time.time()
+        start = time.perf_counter_ns()
         result = cache.get("test_key")
-        elapsed_us = (time.time() - start) * 1_000_000  # Convert to microseconds
+        elapsed_ms = ms_since(start)
 
         assert result is not None
-        assert elapsed_us < 1000, f"Cache lookup took {elapsed_us:.0f}µs, expected < 1000µs"
+        assert elapsed_ms < 1.0, f"Cache lookup took {elapsed_ms:.3f}ms, expected < 1ms"
 
     def test_cache_set_under_1ms(self):
         """Cache writes should be sub-millisecond."""
         cache = URLCache(maxsize=100, ttl=3600)
 
-        start = time.time()
+        start = time.perf_counter_ns()
         cache.set("perf_test", {"data": "test"})
-        elapsed_us = (time.time() - start) * 1_000_000
+        elapsed_ms = ms_since(start)
 
-        assert elapsed_us < 1000, f"Cache write took {elapsed_us:.0f}µs"
+        assert elapsed_ms < 1.0, f"Cache write took {elapsed_ms:.3f}ms"
 
     def test_cache_hit_vs_miss_time_difference(self):
         """Cache hit should be significantly faster than repeated computation."""
@@ -52,9 +56,9 @@ class TestCachePerformance:
         cache.set(key, value)
 
         # Second: cached
-        start2 = time.time()
+        start2 = time.perf_counter_ns()
         result2 = cache.get(key)
-        hit_time = (time.time() - start2) * 1000
+        hit_time = ms_since(start2)
 
         # Hit should be faster (though both very fast)
         assert result2 is not None
@@ -79,9 +83,8 @@ class TestCachePerformance:
         for i in range(15):
             cache.set(f"key_{i}", {"value": i})
 
-        # Cache size should not exceed max (or be close to it)
-        # Note: We can't directly check size, so we verify oldest items might be evicted
-        # The implementation uses cachetools.TTLCache which handles this
+        # Cache size should not exceed max
+        assert cache.size() <= 10
 
     def test_cache_clear_performance(self):
         """Clear operation should be efficient."""
@@ -92,13 +95,70 @@ class TestCachePerformance:
             cache.set(f"key_{i}", {"data": "x" * 100})
 
         # Clear should be fast
-        start = time.time()
+        start = time.perf_counter_ns()
         cache.clear()
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = ms_since(start)
 
         assert elapsed_ms < 100, f"Clear took {elapsed_ms:.1f}ms"
         assert cache.get("key_0") is None
 
+    def test_recently_used_entry_survives_eviction(self):
+        """Reading an entry protects it from the next LRU eviction."""
+        cache = ShardedTTLCache(maxsize=2, ttl=3600, shards=1)
+        cache["a"] = True
+        cache["b"] = True
+
+        assert cache.get("a") is True
+        cache["c"] = True
+
+        assert cache.get("a") is True
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_admission_filter_resists_scan(self):
+        """A burst of one-off keys does not evict a frequently read entry."""
+        cache = ShardedTTLCache(maxsize=2, ttl=3600, shards=1, admission=True)
+        cache["hot"] = True
+        for _ in range(3):
+            cache.get("hot")
+
+        for i in range(10):
+            key = f"scan_{i}"
+            assert cache.get(key) is None
+            cache.offer(key, True)
+
+        assert cache.get("hot") is True
+        assert len(cache) == 2
+
+    def test_set_on_full_cache_always_stores(self):
+        """Explicit set() bypasses admission, even when the victim has been read."""
+        cache = URLCache(maxsize=2, ttl=3600)
+        cache.cache = ShardedTTLCache(maxsize=2, ttl=3600, shards=1, admission=True)
+        cache.set("a", True)
+        cache.set("b", True)
+        for _ in range(3):
+            cache.get("a")
+            cache.get("b")
+
+        cache.set("c", False)
+
+        assert cache.get("c") is False
+
+    def test_hot_set_measured_and_oversize_logged(self, caplog):
+        """A working set far below capacity is measured and reported once."""
+        cache = ShardedTTLCache(maxsize=100, ttl=3600, admission=True)
+        keys = [f"item_{i}" for i in range(20)]
+        assert cache.hot_keys is None
+
+        with caplog.at_level(logging.INFO, logger="src.utils.cache"):
+            for _ in range(100):
+                for key in keys:
+                    cache.get(key)
+
+        assert 16 <= cache.hot_keys <= 20
+        advisories = [r for r in caplog.records if "could be lowered" in r.getMessage()]
+        assert len(advisories) == 1
+
 
 class TestCacheMemoryEfficiency:
     """Test cache memory usage characteristics."""
@@ -125,12 +185,12 @@ class TestCacheMemoryEfficiency:
             cache.set(f"key_{i}", large_value)
 
         # Should still retrieve quickly
-        start = time.time()
+        start = time.perf_counter_ns()
         result = cache.get("key_25")
-        elapsed_us = (time.time() - start) * 1_000_000
+        elapsed_ms = ms_since(start)
 
         assert result is not None
-        assert elapsed_us < 5000
+        assert elapsed_ms < 5.0
 
 
 class TestCacheHitRate:
@@ -165,3 +225,50 @@ class TestCacheHitRate:
                 hits += 1
 
         assert hits == 20
+
+
+class TestCacheSingleFlight:
+    """Test coalescing of concurrent cache misses."""
+
+    async def test_concurrent_misses_compute_once(self):
+        """Concurrent misses for one URL share a single computation."""
+        cache = URLCache(maxsize=100, ttl=3600)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return True, {"queried": calls}
+
+        results = await asyncio.gather(*(cache.getset_if_absent("same", compute) for _ in range(5)))
+
+        assert calls == 1
+        # Waiters receive the computing caller's details, not a cache hit
+        assert results == [(True, {"queried": 1})] * 5
+        assert cache.get("same") is True
+        assert await cache.getset_if_absent("same", compute) == (True, None)
+
+    async def test_failed_computation_retried_by_waiter(self):
+        """A waiter recomputes when the shared computation fails."""
+        cache = URLCache(maxsize=100, ttl=3600)
+        attempts = 0
+
+        async def compute():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            if attempts == 1:
+                msg = "upstream failure"
+                raise RuntimeError(msg)
+            return False, attempts
+
+        first, second = await asyncio.gather(
+            cache.getset_if_absent("flaky", compute),
+            cache.getset_if_absent("flaky", compute),
+            return_exceptions=True,
+        )
+
+        assert isinstance(first, RuntimeError)
+        assert second == (False, 2)
+        assert attempts == 2
@@ -0,0 +1,165 @@
+"""Unit tests for the file-based malware database loader.
+
+Tests verify loading and lookup behavior:
+- CSV and JSON parsing
+- Hostname+port index matching
+- Normalization of lookup inputs
+"""
+
+import dataclasses
+import json
+
+import pytest
+
+from src.services.database_loaders.file_loader import FileLoader
+
+
+class TestFileLoaderCSV:
+    """Test CSV loading and lookups."""
+
+    async def test_exact_match_detected(self, sample_malware_file):
+        """Exact hostname/port/path match is malicious."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        result = await loader.lookup("evil.net", 443, "/trojan")
+        assert result.is_malicious is True
+        assert result.detected_by == "test"
+
+    async def test_hostname_port_match_any_path(self, sample_malware_file):
+        """Hostname+port match is malicious regardless of path."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        result = await loader.lookup("bad.org", 8080, "/other")
+        assert result.is_malicious is True
+
+    async def test_wrong_port_not_detected(self, sample_malware_file):
+        """Known hostname on a different port is safe."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        result = await loader.lookup("bad.org", 80, "/malware.exe")
+        assert result.is_malicious is False
+        assert result.threat_level == "safe"
+
+    async def test_unknown_hostname_not_detected(self, sample_malware_file):
+        """Unknown hostname is safe."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        result = await loader.lookup("google.com", 80, "/")
+        assert result.is_malicious is False
+
+    async def test_lookup_normalizes_hostname(self, sample_malware_file):
+        """Lookup is case-insensitive and ignores surrounding whitespace."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        result = await loader.lookup("  Example.COM ", 80, "/")
+        assert result.is_malicious is True
+
+    async def test_database_size(self, sample_malware_file):
+        """Database size reflects number of loaded entries."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        assert loader.get_database_size() == 3
+
+    async def test_duplicate_entries_counted_once(self, tmp_path):
+        """Duplicate rows collapse while distinct ports and paths are kept."""
+        csv_file = tmp_path / "dupes.csv"
+        csv_file.write_text(
+            "hostname,port,path\nhost.com,80,/a\nHOST.com,80,/a\nhost.com,80,/b\nhost.com,81,/a\n"
+        )
+        loader = FileLoader(name="test", file_path=str(csv_file))
+        await loader.initialize()
+
+        assert loader.get_database_size() == 3
+        assert (await loader.lookup("host.com", 81, "/z")).is_malicious is True
+        assert (await loader.lookup("host.com", 82, "/a")).is_malicious is False
+
+    async def test_optional_columns_default(self, tmp_path):
+        """Missing port/path columns and short rows fall back to defaults."""
+        csv_file = tmp_path / "partial.csv"
+        csv_file.write_text("path,hostname,port\n/a,short.com\n\n/b,full.com,8080\n")
+        loader = FileLoader(name="test", file_path=str(csv_file))
+        await loader.initialize()
+
+        assert loader.get_database_size() == 2
+        assert (await loader.lookup("short.com", 80, "/a")).is_malicious is True
+        assert (await loader.lookup("full.com", 8080, "/b")).is_malicious is True
+
+    async def test_missing_file_is_ready_and_empty(self, tmp_path):
+        """Missing file leaves loader ready with an empty database."""
+        loader = FileLoader(name="test", file_path=str(tmp_path / "missing.csv"))
+        await loader.initialize()
+
+        assert loader.is_ready()
+        assert loader.get_database_size() == 0
+        result = await loader.lookup("example.com", 80, "/")
+        assert result.is_malicious is False
+
+
+class TestFileLoaderJSON:
+    """Test JSON loading and lookups."""
+
+    async def test_json_entries_indexed(self, tmp_path):
+        """JSON entries are loaded and matched by hostname+port."""
+        json_file = tmp_path / "malware.json"
+        json_file.write_text(
+            json.dumps(
+                {
+                    "urls": [
+                        {"hostname": "Malware1.com", "port": 80, "path": "/"},
+                        {"hostname": "malware2.net", "port": "443", "path": "/payload"},
+                    ]
+                }
+            )
+        )
+        loader = FileLoader(name="json", file_path=str(json_file), file_format="json")
+        await loader.initialize()
+
+        assert loader.get_database_size() == 2
+        assert (await loader.lookup("malware1.com", 80, "/x")).is_malicious is True
+        assert (await loader.lookup("malware2.net", 443, "/payload")).is_malicious is True
+        assert (await loader.lookup("malware2.net", 80, "/payload")).is_malicious is False
+
+
+class TestFileLoaderResultReuse:
+    """Test shared lookup results and reloading."""
+
+    async def test_safe_lookups_share_result(self, sample_malware_file):
+        """Safe lookups return the same precomputed ThreatInfo instance."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        first = await loader.lookup("google.com", 80, "/")
+        second = await loader.lookup("bad.org", 80, "/")
+        assert first is second
+        assert first.metadata == {"database_size": 3}
+        assert first.detected_by == "test"
+
+    async def test_shared_result_is_read_only(self, sample_malware_file):
+        """Callers cannot alter the shared ThreatInfo or its metadata."""
+        loader = FileLoader(name="test", file_path=str(sample_malware_file))
+        await loader.initialize()
+
+        result = await loader.lookup("google.com", 80, "/")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.is_malicious = True  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            result.metadata["database_size"] = 0  # type: ignore[index]
+        assert (await loader.lookup("bad.org", 80, "/")).metadata == {"database_size": 3}
+
+    async def test_reinitialize_picks_up_new_entries(self, tmp_path):
+        """Reloading the database replaces the entries lookups are matched against."""
+        csv_file = tmp_path / "reload.csv"
+        csv_file.write_text("hostname,port,path\nfirst.com,80,/\n")
+        loader = FileLoader(name="test", file_path=str(csv_file))
+        await loader.initialize()
+        assert (await loader.lookup("second.com", 80, "/")).is_malicious is False
+
+        csv_file.write_text("hostname,port,path\nsecond.com,80,/\n")
+        await loader.initialize()
+        assert (await loader.lookup("second.com", 80, "/")).is_malicious is True
@@ -0,0 +1,273 @@
+"""Unit tests for the HTTP endpoint malware database loader.
+
+Tests verify response parsing and request batching:
+- Response key aliases and defaults
+- Background connectivity warmup
+- Client sharing between loaders and re-initialization
+- In-flight request limit
+- lookup_many round trips
+- Coalescing of concurrent lookups
+- Overlapping batch round trips
+- Shutdown with lookups still queued or in flight
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from src.services.database_loaders.http_loader import HTTPLoader
+from src.utils import metrics
+
+ENDPOINT = "http://malware-db.test/lookup"
+
+
+async def _start(loader: HTTPLoader, handler) -> list[httpx.Request]:
+    """Initialize the loader against an in-process endpoint and record its requests."""
+    requests: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    await loader.initialize()
+    # The warmup targets the real endpoint, so keep it off the mock
+    loader._warmup_task.cancel()
+    await loader.client.aclose()
+    loader.client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    return requests
+
+
+def _batch_handler(request: httpx.Request) -> httpx.Response:
+    """Flag every query whose hostname starts with 'evil'."""
+    queries = json.loads(request.content)["queries"]
+    return httpx.Response(
+        200, json=[{"is_malicious": q["hostname"].startswith("evil")} for q in queries]
+    )
+
+
+class TestHTTPLoaderBatching:
+    """Test batched lookups against the endpoint."""
+
+    async def test_lookup_many_single_round_trip(self):
+        """lookup_many sends one request and keeps results in query order."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT)
+        requests = await _start(loader, _batch_handler)
+
+        results = await loader.lookup_many([("evil.com", 80, "/"), ("good.com", 443, "/a")])
+
+        assert len(requests) == 1
+        assert requests[0].headers["Content-Type"] == "application/json"
+        assert [r.is_malicious for r in results] == [True, False]
+        await loader.shutdown()
+
+    async def test_lookup_many_result_count_mismatch(self):
+        """A reply with the wrong number of results marks every query as failed."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT)
+        await _start(loader, lambda _: httpx.Response(200, json={"results": []}))
+
+        results = await loader.lookup_many([("evil.com", 80, "/"), ("good.com", 80, "/")])
+
+        assert [r.is_malicious for r in results] == [False, False]
+        assert all("error" in r.metadata for r in results)
+        await loader.shutdown()
+
+    async def test_concurrent_lookups_coalesced(self):
+        """Concurrent lookups are sent as a single batch request."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT, max_batch=16, batch_wait_ms=50)
+        requests = await _start(loader, _batch_handler)
+
+        results = await asyncio.gather(
+            loader.lookup("evil.com"), loader.lookup("good.com"), loader.lookup("evil.org")
+        )
+
+        assert len(requests) == 1
+        assert [r.is_malicious for r in results] == [True, False, True]
+        await loader.shutdown()
+
+    async def test_batches_overlap_slow_round_trips(self):
+        """A new batch is sent while an earlier one is still awaiting its response."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT, max_batch=2, batch_wait_ms=1)
+        release = asyncio.Event()
+        received: list[list[str]] = []
+
+        async def slow(request: httpx.Request) -> httpx.Response:
+            queries = json.loads(request.content)["queries"]
+            received.append([q["hostname"] for q in queries])
+            await release.wait()
+            return _batch_handler(request)
+
+        await _start(loader, lambda _: httpx.Response(200))
+        await loader.client.aclose()
+        loader.client = httpx.AsyncClient(transport=httpx.MockTransport(slow))
+
+        first = asyncio.gather(loader.lookup("evil.com"), loader.lookup("good.com"))
+        await asyncio.sleep(0.02)
+        second = asyncio.gather(loader.lookup("evil.org"), loader.lookup("good.org"))
+        await asyncio.sleep(0.02)
+
+        # Both batches reached the endpoint before either got a response
+        assert received == [["evil.com", "good.com"], ["evil.org", "good.org"]]
+        release.set()
+        assert [r.is_malicious for r in await first] == [True, False]
+        assert [r.is_malicious for r in await second] == [True, False]
+        await loader.shutdown()
+
+    async def test_shutdown_releases_in_flight_batches(self):
+        """Batches still awaiting a response at shutdown resolve as not ready."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT, max_batch=2, batch_wait_ms=1)
+
+        async def hang(request: httpx.Request) -> httpx.Response:
+            await asyncio.Event().wait()
+            return _batch_handler(request)
+
+        await _start(loader, lambda _: httpx.Response(200))
+        await loader.client.aclose()
+        loader.client = httpx.AsyncClient(transport=httpx.MockTransport(hang))
+
+        pending = asyncio.gather(loader.lookup("evil.com"), loader.lookup("good.com"))
+        await asyncio.sleep(0.02)
+        await loader.shutdown()
+
+        results = await asyncio.wait_for(pending, 1)
+        assert [r.metadata for r in results] == [{"error": "Loader not ready"}] * 2
+
+    async def test_shutdown_releases_queued_lookups(self):
+        """Lookups still queued at shutdown resolve as not ready instead of hanging."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT, max_batch=16, batch_wait_ms=1000)
+        await _start(loader, _batch_handler)
+
+        pending = asyncio.create_task(loader.lookup("evil.com"))
+        await asyncio.sleep(0.01)
+        await loader.shutdown()
+
+        result = await asyncio.wait_for(pending, 1)
+        assert result.is_malicious is False
+        assert result.metadata == {"error": "Loader not ready"}
+
+
+class TestHTTPLoaderWarmup:
+    """Test the background connectivity check."""
+
+    async def test_warmup_opens_parallel_connections(self):
+        """Warmup sends its HEAD requests concurrently to the endpoint."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT)
+        requests = await _start(loader, lambda _: httpx.Response(200))
+
+        await loader._warmup()
+
+        assert [r.method for r in requests] == ["HEAD", "HEAD"]
+        await loader.shutdown()
+
+    async def test_warmup_failure_keeps_loader_ready(self):
+        """An unreachable endpoint is logged, not raised, and the loader stays ready."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT)
+
+        def refuse(request: httpx.Request) -> httpx.Response:
+            msg = "refused"
+            raise httpx.ConnectError(msg, request=request)
+
+        await _start(loader, refuse)
+        await loader._warmup()
+
+        assert loader.is_ready()
+        await loader.shutdown()
+
+
+class TestHTTPLoaderSharedClient:
+    """Test reuse of pooled clients across loaders."""
+
+    async def test_same_settings_share_client(self):
+        """Loaders with identical settings share a client until the last one shuts down."""
+        first = HTTPLoader(name="first", endpoint_url=ENDPOINT)
+        second = HTTPLoader(name="second", endpoint_url=f"{ENDPOINT}/v2")
+        other = HTTPLoader(name="other", endpoint_url=ENDPOINT, timeout_seconds=1.0)
+        for loader in (first, second, other):
+            await loader.initialize()
+            loader._warmup_task.cancel()
+        shared = first.client
+
+        assert second.client is shared
+        assert other.client is not shared
+
+        await first.shutdown()
+        assert not shared.is_closed
+        await second.shutdown()
+        assert shared.is_closed
+        await other.shutdown()
+
+    async def test_reinitialize_is_noop(self):
+        """A second initialize() neither leaks a client reference nor restarts tasks."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT, max_batch=4)
+        await loader.initialize()
+        loader._warmup_task.cancel()
+        client, warmup, worker = loader.client, loader._warmup_task, loader._batch_task
+
+        await loader.initialize()
+
+        assert (loader.client, loader._warmup_task, loader._batch_task) == (client, warmup, worker)
+        await loader.shutdown()
+        assert client.is_closed
+
+
+class TestHTTPLoaderInFlightLimit:
+    """Test the cap on concurrent requests to the endpoint."""
+
+    async def test_concurrent_lookups_capped(self):
+        """No more than max_in_flight requests are outstanding at once."""
+        metrics.reset_metrics()
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT, max_in_flight=2)
+        active = peak = 0
+
+        async def slow(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json={"is_malicious": False})
+
+        await loader.initialize()
+        loader._warmup_task.cancel()
+        await loader.client.aclose()
+        loader.client = httpx.AsyncClient(transport=httpx.MockTransport(slow))
+
+        results = await asyncio.gather(*(loader.lookup(f"host{i}.com") for i in range(6)))
+
+        assert peak == 2
+        assert len(results) == 6
+        assert metrics.get_metrics()["gauges"]["http_loader.inflight"] == {"value": 0, "max": 2}
+        await loader.shutdown()
+
+
+class TestHTTPLoaderParseResponse:
+    """Test parsing of the supported response formats."""
+
+    def test_alias_keys(self):
+        """Alternate key names map onto ThreatInfo fields."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT)
+        result = loader._parse_response(
+            {"malicious": True, "type": "phishing", "level": "critical", "confidence": 0.7}
+        )
+
+        assert result.is_malicious is True
+        assert result.threat_type == "phishing"
+        assert result.threat_level == "critical"
+        assert result.confidence_score == 0.7
+
+    def test_primary_key_takes_precedence(self):
+        """The canonical key wins when an alias is also present."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT)
+        result = loader._parse_response({"is_malicious": False, "malicious": True})
+
+        assert result.is_malicious is False
+
+    def test_defaults_follow_verdict(self):
+        """Missing level and confidence default from the malicious verdict."""
+        loader = HTTPLoader(name="http", endpoint_url=ENDPOINT)
+
+        malicious = loader._parse_response({"threat_detected": True})
+        safe = loader._parse_response({})
+
+        assert (malicious.threat_level, malicious.confidence_score) == ("medium", 1.0)
+        assert (safe.threat_level, safe.confidence_score) == ("safe", 0.0)
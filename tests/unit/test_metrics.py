@@ -0,0 +1,98 @@
+"""Unit tests for in-process metrics.
+
+Tests verify counter, timing and gauge summaries:
+- Counter increments, including from other threads
+- Release of finished threads' counter buffers
+- Histogram percentile accuracy
+- Gauge current and peak values
+- Reset behavior
+"""
+
+import threading
+
+import pytest
+
+from src.utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start and finish each test with empty metrics."""
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+class TestMetrics:
+    """Test metric recording and snapshots."""
+
+    def test_counters_accumulate(self):
+        """Counters add up increments."""
+        metrics.incr("hits")
+        metrics.incr("hits", 2)
+
+        assert metrics.get_metrics()["counters"] == {"hits": 3}
+
+    def test_timing_summary(self):
+        """Timing summary reports exact count/min/max/mean and close percentiles."""
+        for value in range(1, 1001):
+            metrics.timing("latency", float(value))
+
+        stats = metrics.get_metrics()["timings"]["latency"]
+        assert stats["count"] == 1000
+        assert stats["min_ms"] == 1.0
+        assert stats["max_ms"] == 1000.0
+        assert stats["mean_ms"] == pytest.approx(500.5)
+        # Log buckets are ~9% wide
+        assert stats["p50_ms"] == pytest.approx(500, rel=0.1)
+        assert stats["p95_ms"] == pytest.approx(950, rel=0.1)
+        assert stats["p99_ms"] == pytest.approx(990, rel=0.1)
+
+    def test_single_sample_percentiles(self):
+        """With one sample every percentile is that sample."""
+        metrics.timing("latency", 4.2)
+
+        stats = metrics.get_metrics()["timings"]["latency"]
+        assert stats["p50_ms"] == stats["p95_ms"] == stats["p99_ms"] == 4.2
+
+    def test_gauge_tracks_value_and_peak(self):
+        """A gauge reports its latest value and the highest it has reached."""
+        for value in (1, 3, 2):
+            metrics.gauge("inflight", value)
+
+        assert metrics.get_metrics()["gauges"] == {"inflight": {"value": 2, "max": 3}}
+
+    def test_reset_clears_everything(self):
+        """reset_metrics drops counters, timings and gauges."""
+        metrics.incr("hits")
+        metrics.timing("latency", 1.0)
+        metrics.gauge("inflight", 1)
+        metrics.reset_metrics()
+
+        assert metrics.get_metrics() == {"counters": {}, "timings": {}, "gauges": {}}
+
+    def test_counters_from_other_threads_included(self):
+        """Increments made in worker threads appear in the snapshot."""
+
+        def work():
+            for _ in range(100):
+                metrics.incr("hits")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics.incr("hits")
+
+        assert metrics.get_metrics()["counters"]["hits"] == 401
+
+    def test_finished_thread_buffers_released(self):
+        """Counts from exited threads survive while their buffers are dropped."""
+        threads = [threading.Thread(target=metrics.incr, args=("hits",)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+
+        assert metrics.get_metrics()["counters"]["hits"] == 10
+        assert all(thread.is_alive() for thread, _ in metrics._counter_buffers)